@@ -0,0 +1,179 @@
+"""
+Numba-compiled proof-of-work nonce search.
+
+Implements SHA-256 over 32-bit words inside an @njit kernel so the nonce scan
+runs without touching the interpreter. The kernel hashes exactly the bytes that
+Block.calculate_hash() hashes (prefix + decimal nonce + suffix) and always
+returns the smallest matching nonce of a batch, so results are identical to the
+pure-Python mining loop.
+
+This module requires numba and numpy; callers import it lazily and fall back
+to hashlib when they are missing.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+_MASK = 0xFFFFFFFF
+
+# Number of independent slices each batch is split into for prange
+_CHUNKS = 64
+
+_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.int64)
+
+_H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+    0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.int64)
+
+
+@njit(cache=True, inline='always')
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & _MASK
+
+
+@njit(cache=True)
+def _compress(state, buf, offset, w):
+    """Run the SHA-256 compression function on buf[offset:offset+64]."""
+    for t in range(16):
+        i = offset + 4 * t
+        w[t] = (np.int64(buf[i]) << 24) | (np.int64(buf[i + 1]) << 16) | \
+               (np.int64(buf[i + 2]) << 8) | np.int64(buf[i + 3])
+    for t in range(16, 64):
+        x = w[t - 15]
+        s0 = _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> 3)
+        x = w[t - 2]
+        s1 = _rotr(x, 17) ^ _rotr(x, 19) ^ (x >> 10)
+        w[t] = (w[t - 16] + s0 + w[t - 7] + s1) & _MASK
+
+    a, b, c, d = state[0], state[1], state[2], state[3]
+    e, f, g, h = state[4], state[5], state[6], state[7]
+    for t in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ ((e ^ _MASK) & g)
+        t1 = (h + s1 + ch + _K[t] + w[t]) & _MASK
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        t2 = (s0 + maj) & _MASK
+        h = g
+        g = f
+        f = e
+        e = (d + t1) & _MASK
+        d = c
+        c = b
+        b = a
+        a = (t1 + t2) & _MASK
+
+    state[0] = (state[0] + a) & _MASK
+    state[1] = (state[1] + b) & _MASK
+    state[2] = (state[2] + c) & _MASK
+    state[3] = (state[3] + d) & _MASK
+    state[4] = (state[4] + e) & _MASK
+    state[5] = (state[5] + f) & _MASK
+    state[6] = (state[6] + g) & _MASK
+    state[7] = (state[7] + h) & _MASK
+
+
+@njit(cache=True)
+def _has_leading_zeros(state, difficulty):
+    """Check that the digest starts with `difficulty` zero hex digits."""
+    for k in range(difficulty):
+        word = state[k // 8]
+        if (word >> (28 - 4 * (k % 8))) & 0xF:
+            return False
+    return True
+
+
+@njit(parallel=True, cache=True)
+def find_nonce(prefix, suffix, difficulty, start, span):
+    """Return the smallest nonce in [start, start + span) that satisfies the
+    difficulty target, or -1 if the range holds none.
+
+    prefix and suffix are uint8 arrays holding the serialized block data
+    before and after the decimal nonce.
+    """
+    w = np.empty(64, dtype=np.int64)
+
+    # Absorb every full 64-byte block of the prefix once (the midstate)
+    midstate = _H0.copy()
+    full = (prefix.shape[0] // 64) * 64
+    for offset in range(0, full, 64):
+        _compress(midstate, prefix, offset, w)
+    rest = prefix[full:]
+
+    chunk = (span + _CHUNKS - 1) // _CHUNKS
+    hits = np.full(_CHUNKS, -1, dtype=np.int64)
+
+    for c in prange(_CHUNKS):
+        lo = start + c * chunk
+        hi = min(lo + chunk, start + span)
+        # 20 digits covers any int64 nonce; 72 bytes of slack covers padding
+        buf = np.empty(rest.shape[0] + 20 + suffix.shape[0] + 72, dtype=np.uint8)
+        digits = np.empty(20, dtype=np.uint8)
+        sched = np.empty(64, dtype=np.int64)
+        state = np.empty(8, dtype=np.int64)
+        buf[:rest.shape[0]] = rest
+
+        for nonce in range(lo, hi):
+            # Decimal encoding of the nonce, matching str(nonce)
+            n = nonce
+            nd = 0
+            while True:
+                digits[nd] = 48 + n % 10
+                n //= 10
+                nd += 1
+                if n == 0:
+                    break
+            pos = rest.shape[0]
+            for i in range(nd):
+                buf[pos + i] = digits[nd - 1 - i]
+            pos += nd
+            buf[pos:pos + suffix.shape[0]] = suffix
+            pos += suffix.shape[0]
+
+            # SHA-256 padding: 0x80, zeros, then the 64-bit message bit length
+            bit_len = (full + pos) * 8
+            buf[pos] = 0x80
+            pos += 1
+            while pos % 64 != 56:
+                buf[pos] = 0
+                pos += 1
+            for i in range(8):
+                buf[pos + i] = (bit_len >> (56 - 8 * i)) & 0xFF
+            pos += 8
+
+            state[:] = midstate
+            for offset in range(0, pos, 64):
+                _compress(state, buf, offset, sched)
+
+            if _has_leading_zeros(state, difficulty):
+                hits[c] = nonce
+                break
+
+    best = -1
+    for c in range(_CHUNKS):
+        if hits[c] >= 0 and (best < 0 or hits[c] < best):
+            best = hits[c]
+    return best
+
+
+def search_nonce(prefix: bytes, suffix: bytes, difficulty: int, start: int = 0,
+                 batch_size: int = 1 << 20) -> int:
+    """Scan nonces from `start` in batches until one meets the difficulty target."""
+    prefix_arr = np.frombuffer(prefix, dtype=np.uint8)
+    suffix_arr = np.frombuffer(suffix, dtype=np.uint8)
+    nonce = start
+    while True:
+        hit = find_nonce(prefix_arr, suffix_arr, difficulty, nonce, batch_size)
+        if hit >= 0:
+            return int(hit)
+        nonce += batch_size
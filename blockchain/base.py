@@ -1,15 +1,77 @@
 import hashlib
 import time
 import json
-import sys
-import os
-from typing import List, Dict, Any, Optional
+import re
+import pickle
+import multiprocessing
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Tuple
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.merkle import MerkleTree, transaction_hash
+from constants import POW_NUMBA_MIN_DIFFICULTY, POW_NUMBA_BATCH_SIZE, VERIFY_PARALLEL_MIN_BLOCKS
 
-from utils.merkle import MerkleTree
-from utils.math_helpers import safe_equals
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.loads turns integers wider than 64 bits into floats, so files holding
+# long digit runs (EC coordinates) are parsed with json instead
+_LONG_DIGITS = re.compile(rb'\d{20}')
+
+# Merkle root of a block without transactions, as MerkleTree([]) reports it
+_EMPTY_MERKLE_ROOT = hashlib.sha256(b"").hexdigest()
+
+_numba_search_nonce = None
+
+def _get_numba_search():
+    """Lazily import the compiled nonce search; returns None without numba."""
+    global _numba_search_nonce
+    if _numba_search_nonce is None:
+        try:
+            from blockchain._pow_numba import search_nonce
+            _numba_search_nonce = search_nonce
+        except ImportError:
+            _numba_search_nonce = False
+    return _numba_search_nonce or None
+
+def _block_hash(index: int, timestamp: float, merkle_root: str, previous_hash: str, nonce: int) -> str:
+    """SHA-256 of the block fields in json.dumps(..., sort_keys=True) layout."""
+    block_string = (
+        f'{{"index": {index}, "merkle_root": "{merkle_root}", '
+        f'"nonce": {nonce}, "previous_hash": "{previous_hash}", '
+        f'"timestamp": {timestamp!r}}}'
+    )
+    return hashlib.sha256(block_string.encode()).hexdigest()
+
+def _check_block(fields: tuple) -> Tuple[bool, bool]:
+    """Check one block's stored hash and Merkle root; runs in worker processes."""
+    index, timestamp, merkle_root, previous_hash, nonce, block_hash, transactions = fields
+    hash_ok = block_hash == _block_hash(index, timestamp, merkle_root, previous_hash, nonce)
+    return hash_ok, merkle_root == MerkleTree.root_of(transactions)
+
+def _tx_amount(tx: Dict[str, Any]) -> float:
+    """Plaintext amount of a transaction, or 0.0 if it has none that converts to a float."""
+    try:
+        return float(tx.get('amount', 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+def tx_id_key(tx_id: Any) -> Any:
+    """Set key for a tx_id: the 64-bit integer value of a 16-digit hex id.
+    
+    Ids in any other form (coinbase ids from other sources, None) are returned
+    unchanged so they still work as keys.
+    """
+    if isinstance(tx_id, str) and len(tx_id) == 16:
+        try:
+            return int(tx_id, 16)
+        except ValueError:
+            pass
+    return tx_id
 
 class Block:
     """Basic block structure for the blockchain."""
@@ -20,34 +82,103 @@ class Block:
         self.transactions = transactions
         self.previous_hash = previous_hash
         self.nonce = nonce
-        self.merkle_tree = MerkleTree(transactions)
-        self.merkle_root = self.merkle_tree.get_root_hash()
+        self._build_merkle_tree()
+        self._reset_tx_caches()
         self.hash = self.calculate_hash()
         
+    def _build_merkle_tree(self) -> None:
+        """Build the Merkle tree and root; empty blocks (genesis) get no tree."""
+        if not self.transactions:
+            self.merkle_tree = None
+            self.merkle_root = _EMPTY_MERKLE_ROOT
+        else:
+            self.merkle_tree = MerkleTree(self.transactions)
+            self.merkle_root = self.merkle_tree.get_root_hash()
+    
+    def _reset_tx_caches(self) -> None:
+        """Rebuild the tx_id lookup and drop memoized Merkle proofs."""
+        self._tx_index: Dict[Any, int] = {}
+        for i, tx in enumerate(self.transactions):
+            tx_id = tx.get('tx_id')
+            if tx_id is not None:
+                self._tx_index.setdefault(tx_id, i)
+        # leaf index -> Merkle proof
+        self._proof_cache: Dict[int, List[Dict[str, str]]] = {}
+        self._columns = None
+    
+    def _tx_columns(self) -> Tuple[List[Optional[str]], List[Optional[str]], array]:
+        """Column view of the transactions: senders, recipients and amounts.
+        
+        Built on first use and kept alongside the transaction dicts, which stay
+        the canonical copy for hashing and serialization. Amounts that are not
+        numbers count as 0.
+        """
+        if self._columns is None:
+            senders = [tx.get('sender_address') for tx in self.transactions]
+            recipients = [tx.get('recipient_address') for tx in self.transactions]
+            amounts = array('d', (
+                _tx_amount(tx) if sender is not None or recipient is not None else 0.0
+                for tx, sender, recipient in zip(self.transactions, senders, recipients)
+            ))
+            self._columns = (senders, recipients, amounts)
+        return self._columns
+    
     def calculate_hash(self) -> str:
-        """Calculate SHA-256 hash of the block data using a Merkle root."""
-        block_data = {
-            'index': self.index,
-            'timestamp': self.timestamp,
-            'merkle_root': self.merkle_root,
-            'previous_hash': self.previous_hash,
-            'nonce': self.nonce
-        }
-        block_string = json.dumps(block_data, sort_keys=True).encode()
-        return hashlib.sha256(block_string).hexdigest()
+        """Calculate SHA-256 hash of the block data using a Merkle root.
+        
+        The string is built directly in the layout json.dumps(..., sort_keys=True)
+        produces for these five fields, so existing block hashes are unchanged.
+        """
+        return _block_hash(self.index, self.timestamp, self.merkle_root, self.previous_hash, self.nonce)
     
     def recalculate_merkle_root(self) -> None:
         """Recalculate Merkle root for block transactions."""
-        self.merkle_tree = MerkleTree(self.transactions)
-        self.merkle_root = self.merkle_tree.get_root_hash()
+        self._build_merkle_tree()
+        self._reset_tx_caches()
         self.hash = self.calculate_hash()
     
+    def _hash_parts(self) -> Tuple[bytes, bytes]:
+        """Split the serialized block data around the nonce.
+        
+        The string hashed by calculate_hash() is prefix + str(nonce) + suffix,
+        so the mining loop only has to encode the nonce for each candidate.
+        """
+        prefix = f'{{"index": {self.index}, "merkle_root": "{self.merkle_root}", "nonce": '
+        suffix = f', "previous_hash": "{self.previous_hash}", "timestamp": {self.timestamp!r}}}'
+        return prefix.encode(), suffix.encode()
+    
     def mine_block(self, difficulty: int = 2) -> None:
         """Mine a block by finding a hash with leading zeros."""
-        target = '0' * difficulty
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        prefix, suffix = self._hash_parts()
+        
+        # Hand long searches to the compiled kernel when numba is available
+        if difficulty >= POW_NUMBA_MIN_DIFFICULTY:
+            search = _get_numba_search()
+            if search is not None:
+                self.nonce = search(prefix, suffix, difficulty, self.nonce, POW_NUMBA_BATCH_SIZE)
+                self.hash = self.calculate_hash()
+                return
+        
+        # The prefix is identical for every candidate, so absorb it once and
+        # copy the hasher state per nonce instead of re-hashing it each time
+        base = hashlib.sha256(prefix)
+        
+        # The digest meets the target when its leading 64 bits (more for
+        # difficulties above 16) are below this limit: one integer compare
+        head_len = max(8, (difficulty + 1) // 2)
+        limit = 1 << (8 * head_len - 4 * difficulty)
+        
+        nonce = self.nonce
+        while True:
+            hasher = base.copy()
+            hasher.update(str(nonce).encode() + suffix)
+            digest = hasher.digest()
+            if int.from_bytes(digest[:head_len], 'big') < limit:
+                break
+            nonce += 1
+        
+        self.nonce = nonce
+        self.hash = digest.hex()
             
     def to_dict(self) -> Dict[str, Any]:
         """Convert block to a serializable dictionary."""
@@ -61,6 +192,20 @@ class Block:
             'hash': self.hash
         }
     
+    def summary(self) -> str:
+        """One-string overview of the block's header fields, for console output.
+        
+        Built on each call rather than cached: mining and tampering both
+        reassign the hash after construction.
+        """
+        return (
+            f"Index: {self.index}\n"
+            f"Hash: {self.hash[:16]}...\n"
+            f"Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.timestamp))}\n"
+            f"Transactions: {len(self.transactions)}\n"
+            f"Previous Hash: {self.previous_hash[:16]}..."
+        )
+    
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> 'Block':
         """Create a Block instance from a dictionary."""
@@ -71,26 +216,33 @@ class Block:
             data['previous_hash'],
             data['nonce']
         )
-        # Handle backward compatibility for blocks lacking merkle_root
+        # Blocks lacking merkle_root (older files) keep the root the
+        # constructor just computed; rebuilding the tree would re-hash every leaf
         if 'merkle_root' in data:
             block.merkle_root = data['merkle_root']
-        else:
-            block.recalculate_merkle_root()
             
         block.hash = data['hash']
         return block
     
     def verify_transaction(self, transaction: Dict[str, Any]) -> bool:
         """Verify that a transaction exists in this block using Merkle proof."""
-        if transaction not in self.transactions:
+        if self.merkle_tree is None:
             return False
         
-        # Calculate the transaction hash
-        tx_string = json.dumps(transaction, sort_keys=True).encode()
-        tx_hash = hashlib.sha256(tx_string).hexdigest()
+        i = self._tx_index.get(transaction.get('tx_id'))
+        if i is None or self.transactions[i] != transaction:
+            if transaction not in self.transactions:
+                return False
+            i = self.transactions.index(transaction)
         
-        # Get the Merkle proof
-        proof = self.merkle_tree.get_proof(transaction)
+        # The path depends only on the tree, but the leaf hash is recomputed
+        # every time so an edited transaction no longer verifies
+        tx_hash = transaction_hash(transaction)
+        proof = self._proof_cache.get(i)
+        if proof is None:
+            proof = self.merkle_tree.get_proof(transaction)
+            if proof:
+                self._proof_cache[i] = proof
         
         # Verify the proof
         return self.merkle_tree.verify_proof(tx_hash, proof)
@@ -101,6 +253,11 @@ class Blockchain:
     def __init__(self):
         self.chain: List[Block] = []
         self.pending_transactions: List[Dict[str, Any]] = []
+        # address -> [(chain position, tx position, balance delta)]
+        self._address_index: Dict[str, List[Tuple[int, int, float]]] = defaultdict(list)
+        self._balance_cache: Dict[str, float] = {}
+        # tx_id -> (chain position, tx position) of its first occurrence
+        self._txid_index: Dict[Any, Tuple[int, int]] = {}
         self.create_genesis_block()
         self.difficulty = 2
     
@@ -115,6 +272,8 @@ class Blockchain:
     
     def add_transaction(self, transaction: Dict[str, Any]) -> bool:
         """Add a new transaction to pending transactions list."""
+        if not isinstance(transaction, dict):
+            transaction = transaction.to_dict()
         self.pending_transactions.append(transaction)
         return True
     
@@ -138,6 +297,7 @@ class Blockchain:
         
         # Add new block to chain
         self.chain.append(block)
+        self._index_block(len(self.chain) - 1)
         
         # Clear pending transactions
         self.pending_transactions = []
@@ -145,29 +305,51 @@ class Blockchain:
         return block
     
     def verify_chain(self) -> bool:
-        """Verify that the blockchain is valid."""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i-1]
-            
+        """Verify that the blockchain is valid.
+        
+        Every block's hash, link and Merkle root are re-checked on each call,
+        since blocks can be edited in place after an earlier check passed.
+        """
+        checks = self._check_blocks()
+        
+        for i, (hash_ok, merkle_ok) in enumerate(checks, 1):
             # Verify block hash
-            if current_block.hash != current_block.calculate_hash():
+            if not hash_ok:
                 print(f"Hash mismatch on block {i}")
                 return False
             
             # Verify chain integrity
-            if current_block.previous_hash != previous_block.hash:
+            if self.chain[i].previous_hash != self.chain[i-1].hash:
                 print(f"Chain broken at block {i}")
                 return False
             
             # Verify Merkle root is valid
-            merkle_tree = MerkleTree(current_block.transactions)
-            if current_block.merkle_root != merkle_tree.get_root_hash():
+            if not merkle_ok:
                 print(f"Merkle root mismatch on block {i}")
                 return False
         
         return True
         
+    def _check_blocks(self) -> List[Tuple[bool, bool]]:
+        """Hash and Merkle checks for every block after genesis, as (hash_ok, merkle_ok).
+        
+        Long runs are spread over worker processes; short ones (or a pool that
+        fails to start or pickle its input) are checked in this process. Workers
+        are spawned, not forked, because callers such as the state manager run
+        threads whose held locks a fork would copy.
+        """
+        fields = [
+            (b.index, b.timestamp, b.merkle_root, b.previous_hash, b.nonce, b.hash, b.transactions)
+            for b in self.chain[1:]
+        ]
+        if len(fields) >= VERIFY_PARALLEL_MIN_BLOCKS:
+            try:
+                with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+                    return list(executor.map(_check_block, fields, chunksize=16))
+            except (OSError, BrokenProcessPool, pickle.PicklingError):
+                pass
+        return [_check_block(f) for f in fields]
+    
     def verify_transaction(self, tx_id: str) -> tuple:
         """Verify a transaction exists in the blockchain and is valid.
         
@@ -177,45 +359,64 @@ class Blockchain:
         Returns:
             tuple: (is_valid, block_index, tx_index) or (False, None, None) if not found
         """
-        for block in self.chain:
-            for i, tx in enumerate(block.transactions):
-                if tx.get('tx_id') == tx_id:
-                    # Found transaction, verify its inclusion using Merkle proofs
-                    is_valid = block.verify_transaction(tx)
-                    return is_valid, block.index, i
-        
-        return False, None, None
+        location = self._txid_index.get(tx_id)
+        if location is None:
+            return False, None, None
+        
+        # Verify its inclusion using Merkle proofs
+        position, i = location
+        block = self.chain[position]
+        return block.verify_transaction(block.transactions[i]), block.index, i
+
+    def _index_block(self, position: int) -> None:
+        """Add the transactions of the block at `position` to the tx_id and address indexes."""
+        block = self.chain[position]
+        for tx_id, i in block._tx_index.items():
+            self._txid_index.setdefault(tx_id, (position, i))
+        
+        senders, recipients, amounts = block._tx_columns()
+        for i, (sender, recipient, amount) in enumerate(zip(senders, recipients, amounts)):
+            if sender is None and recipient is None:
+                continue
+            
+            if sender == recipient:
+                # Credit and debit cancel out, but the transaction is still listed
+                self._address_index[sender].append((position, i, 0.0))
+                self._balance_cache.setdefault(sender, 0.0)
+                continue
+            
+            if sender is not None:
+                self._address_index[sender].append((position, i, amount))
+                self._balance_cache[sender] = self._balance_cache.get(sender, 0.0) + amount
+            if recipient is not None:
+                self._address_index[recipient].append((position, i, -amount))
+                self._balance_cache[recipient] = self._balance_cache.get(recipient, 0.0) - amount
+    
+    def _rebuild_address_index(self) -> None:
+        """Rebuild the tx_id index, address index and balance cache from the whole chain."""
+        self._address_index = defaultdict(list)
+        self._balance_cache = {}
+        self._txid_index = {}
+        for position in range(len(self.chain)):
+            self._index_block(position)
 
     def scan_for_transactions(self, address: str) -> List[Dict[str, Any]]:
         """Scan the blockchain for transactions involving an address."""
         transactions = []
         
-        for block in self.chain:
-            for tx in block.transactions:
-                # First try to use the full address if available
-                if (tx.get('sender_address') == address or 
-                    tx.get('recipient_address') == address):
-                    transactions.append({
-                        'block_index': block.index,
-                        'block_hash': block.hash,
-                        'transaction': tx
-                    })
+        for position, tx_idx, _ in self._address_index.get(address, ()):
+            block = self.chain[position]
+            transactions.append({
+                'block_index': block.index,
+                'block_hash': block.hash,
+                'transaction': block.transactions[tx_idx]
+            })
         
         return transactions
     
     def get_balance(self, address: str) -> float:
         """Calculate the balance of an address from blockchain transactions."""
-        balance = 0.0
-        
-        for block in self.chain:
-            for tx in block.transactions:
-                # First check if the modern address field is available
-                if tx.get('sender_address') == address:
-                    balance += float(tx.get('amount', 0))
-                if tx.get('recipient_address') == address:
-                    balance -= float(tx.get('amount', 0))
-        
-        return balance
+        return self._balance_cache.get(address, 0.0)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert blockchain to serializable dictionary."""
@@ -232,16 +433,33 @@ class Blockchain:
         blockchain.chain = [Block.from_dict(block_data) for block_data in data['chain']]
         blockchain.pending_transactions = data['pending_transactions']
         blockchain.difficulty = data['difficulty']
+        blockchain._rebuild_address_index()
         return blockchain
     
     def save_to_file(self, filename: str) -> None:
         """Save blockchain to a JSON file."""
-        with open(filename, 'w') as file:
-            json.dump(self.to_dict(), file, indent=2)
+        data = self.to_dict()
+        payload = None
+        if orjson is not None:
+            try:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            except TypeError:
+                # Integers beyond 64 bits or types orjson cannot encode
+                payload = None
+        if payload is None:
+            payload = json.dumps(data, indent=2).encode()
+        
+        with open(filename, 'wb') as file:
+            file.write(payload)
     
     @staticmethod
     def load_from_file(filename: str) -> 'Blockchain':
         """Load blockchain from a JSON file."""
-        with open(filename, 'r') as file:
-            data = json.load(file)
-            return Blockchain.from_dict(data)
+        with open(filename, 'rb') as file:
+            raw = file.read()
+        
+        if orjson is not None and not _LONG_DIGITS.search(raw):
+            data = orjson.loads(raw)
+        else:
+            data = json.loads(raw)
+        return Blockchain.from_dict(data)
@@ -1,26 +1,26 @@
 import time
+import logging
+import threading
 import hashlib
 import json
+from operator import itemgetter
 from typing import Dict, Any, List, Optional, Tuple
 
-from blockchain.base import Blockchain
+from blockchain.base import Blockchain, tx_id_key
 from blockchain.state_manager import BlockchainStateManager
-import sys
-import os
-
-# Add the parent directory to the path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from schemes.ring_pedersen_elgamal import RingPedersenElGamal, StealthAccount
-from tinyec import registry
 from tinyec.ec import Point
 
 from utils.math_helpers import safe_equals
 
+_log = logging.getLogger(__name__)
+
+_CIPHERTEXT_COORDS = itemgetter('ciphertext_c1_x', 'ciphertext_c1_y', 'ciphertext_c2_x', 'ciphertext_c2_y')
+
 def reconstruct_ciphertext_from_dict(data, curve):
-    c1 = Point(curve, data['ciphertext_c1_x'], data['ciphertext_c1_y'])
-    c2 = Point(curve, data['ciphertext_c2_x'], data['ciphertext_c2_y'])
-    return (c1, c2)
+    c1_x, c1_y, c2_x, c2_y = _CIPHERTEXT_COORDS(data)
+    return (Point(curve, c1_x, c1_y), Point(curve, c2_x, c2_y))
 
 def point_to_dict(point: Point) -> Dict[str, int]:
     """Convert EC point to dictionary representation."""
@@ -33,21 +33,23 @@ def dict_to_point(point_dict: Dict[str, int], curve) -> Point:
 class RingTransaction:
     """A ring signature transaction with stealth addressing."""
     def __init__(self, sender_pk, stealth_address, ciphertext, ring_signature, public_keys, 
-                 sender_address=None, recipient_address=None):
+                 sender_address=None, recipient_address=None, timestamp=None):
         self.sender_pk = sender_pk
         self.stealth_R, self.stealth_P = stealth_address  # R and P values for stealth address
         self.ciphertext = ciphertext
         self.ring_signature = ring_signature
         self.public_keys = public_keys
-        self.timestamp = time.time()
+        self.timestamp = time.time() if timestamp is None else timestamp
         self.sender_address = sender_address or f"{self.sender_pk.x}:{self.sender_pk.y}"
         self.recipient_address = recipient_address or f"stealth:{self.stealth_P.x}:{self.stealth_P.y}"
+        self._id_prefix = f"{self.sender_address}:{self.recipient_address}:".encode()
         self.tx_id = self._generate_tx_id()
     
     def _generate_tx_id(self) -> str:
         """Generate a unique transaction ID."""
-        data = f"{self.sender_address}:{self.recipient_address}:{self.timestamp}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        h = hashlib.sha256(self._id_prefix)
+        h.update(str(self.timestamp).encode())
+        return h.hexdigest()[:16]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert transaction to serializable dict for blockchain storage."""
@@ -68,19 +70,13 @@ class RingTransaction:
         }
     
     @staticmethod
-    def verify_transaction(tx_dict: Dict[str, Any], ring_system: RingPedersenElGamal) -> bool:
-        """Verify transaction validity using ring signature."""
+    def _verify_one(tx_dict: Dict[str, Any], ring_system: RingPedersenElGamal, curve) -> bool:
+        """Check one transaction dict's ring signature against an already-resolved curve."""
         if tx_dict.get("sender_address") == "COINBASE":
             return True
 
         try:
-            # Reconstruct public keys from dict
-            curve = registry.get_curve(ring_system.curve)
-            public_keys = [dict_to_point(pk_dict, ring_system.curve) 
-                          for pk_dict in tx_dict['public_keys']]
-            
-            # Reconstruct ciphertext
-            ciphertext = reconstruct_ciphertext_from_dict(tx_dict, ring_system.curve)
+            public_keys = [dict_to_point(pk_dict, curve) for pk_dict in tx_dict['public_keys']]
             
             # Generate message for signature verification
             message = f"{tx_dict['sender_address']}:{tx_dict['recipient_address']}:{tx_dict['timestamp']}"
@@ -88,8 +84,21 @@ class RingTransaction:
             # Verify the ring signature
             return ring_system.verify_ring_signature(message, public_keys, tx_dict['ring_signature'])
         except Exception as e:
-            print(f"Error verifying transaction: {str(e)}")
+            _log.error("Error verifying transaction: %s", e)
             return False
+    
+    @staticmethod
+    def verify_transaction(tx_dict: Dict[str, Any], ring_system: RingPedersenElGamal) -> bool:
+        """Verify transaction validity using ring signature."""
+        # ring_system.curve is already the resolved curve object, so no
+        # registry lookup is needed
+        return RingTransaction._verify_one(tx_dict, ring_system, ring_system.curve)
+
+    @staticmethod
+    def verify_batch(tx_dicts: List[Dict[str, Any]], ring_system: RingPedersenElGamal) -> List[bool]:
+        """Verify a batch of transactions, sharing the curve across all of them."""
+        curve = ring_system.curve
+        return [RingTransaction._verify_one(tx_dict, ring_system, curve) for tx_dict in tx_dicts]
 
 class RingBlockchainWallet:
     """Wallet for blockchain transactions using Ring Pedersen ElGamal with stealth addresses."""
@@ -104,7 +113,10 @@ class RingBlockchainWallet:
         self.public_key = self.spend_pk  # For compatibility
         
         self.transactions = []
-        self.spent_nullifiers = set()
+        self.spent_nullifiers = set()  # tx_id_key() of processed transactions
+        self._scan_lock = threading.Lock()  # Scans may come from listener threads
+        # Blocks up to this index have already been scanned
+        self._last_scanned_block = -1
 
         # Register for blockchain events
         self.state_manager.add_listener('block_mined', self._on_block_mined)
@@ -112,14 +124,18 @@ class RingBlockchainWallet:
         # Format address to include both view and spend keys
         self.address = f"ring:{self.view_pk.x}:{self.view_pk.y}:{self.spend_pk.x}:{self.spend_pk.y}"
     
-    def send_transaction(self, recipient_wallet, amount: int) -> bool:
-        """Send funds to another wallet using Ring Pedersen ElGamal with stealth addressing."""
+    def send_transaction(self, recipient_wallet, amount: int, known_balance: Optional[int] = None) -> bool:
+        """Send funds to another wallet using Ring Pedersen ElGamal with stealth addressing.
+        
+        known_balance lets a caller that already read the balance skip reading it again.
+        """
         if amount <= 0:
-            print("Amount must be positive")
+            _log.warning("Amount must be positive")
             return False
         
-        if amount > self.get_balance():
-            print(f"Insufficient funds: {self.get_balance()} < {amount}")
+        balance = self.get_balance() if known_balance is None else known_balance
+        if amount > balance:
+            _log.warning("Insufficient funds: %s < %s", balance, amount)
             return False
         
         # Get recipient's view and spend public keys
@@ -162,7 +178,7 @@ class RingBlockchainWallet:
         if result:
             self.account.balance -= amount
             self.transactions.append(transaction)
-            print(f"{self.name} sent {amount} coins via stealth address")
+            _log.info("%s sent %s coins via stealth address", self.name, amount)
         
         return result
     
@@ -173,63 +189,75 @@ class RingBlockchainWallet:
     def deposit(self, amount: int) -> bool:
         """Deposit funds directly into account (used for testing)."""
         if amount <= 0:
-            print("Deposit amount must be positive")
+            _log.warning("Deposit amount must be positive")
             return False
         
         self.account.balance += amount
         return True
     
-    def scan_for_transactions(self):
-        """Scan blockchain for transactions involving this wallet."""        
-        # Also scan for stealth transactions directed to us
-        all_transactions = self.state_manager.get_all_transactions()
+    def scan_for_transactions(self, since: Optional[int] = None):
+        """Scan blockchain for transactions involving this wallet.
+        
+        Only blocks after `since` (default: the last block already scanned) are
+        walked; pending and mempool transactions are always checked.
+        """
+        with self._scan_lock:
+            if since is None:
+                since = self._last_scanned_block
         
-        for tx in all_transactions:
-            is_coinbase = tx.get('sender_address') == 'COINBASE' and tx.get('recipient_address') == self.address
+            # Read the tip first so a block mined mid-scan is rescanned, not skipped
+            tip = self.state_manager.get_latest_block_index()
+            new_transactions = self.state_manager.get_transactions_since(since)
+        
+            for tx in new_transactions:
+                is_coinbase = tx.get('sender_address') == 'COINBASE' and tx.get('recipient_address') == self.address
 
-            # Skip non-stealth or already processed transactions
-            if not tx.get('recipient_address', '').startswith('stealth:') and not is_coinbase:
-                continue
+                # Skip non-stealth or already processed transactions
+                if not tx.get('recipient_address', '').startswith('stealth:') and not is_coinbase:
+                    continue
                 
-            if tx.get('tx_id') in self.spent_nullifiers:
-                continue
+                tx_key = tx_id_key(tx.get('tx_id'))
+                if tx_key in self.spent_nullifiers:
+                    continue
 
-            # Get stealth address components
-            try:
-                if not is_coinbase:                
-                    R = dict_to_point(tx['stealth_R'], self.ring_system.curve)
-                    P = dict_to_point(tx['stealth_P'], self.ring_system.curve)
-                else:
-                    R = None
-                    P = None
-                
-                # Check if this stealth transaction belongs to us
-                if is_coinbase or self.ring_system.recover_stealth_address(R, P, self.account.view_sk, self.spend_pk):
-                    # Found a stealth transaction for us! Decrypt it
-                    if tx.get('amount') != None:
-                        amount = tx.get('amount')
+                # Get stealth address components
+                try:
+                    if not is_coinbase:                
+                        R = dict_to_point(tx['stealth_R'], self.ring_system.curve)
+                        P = dict_to_point(tx['stealth_P'], self.ring_system.curve)
                     else:
-                        ciphertext = reconstruct_ciphertext_from_dict(tx, self.ring_system.curve)
-                        amount = self.ring_system.twisted_elgamal_decrypt(ciphertext, self.account.view_sk)
+                        R = None
+                        P = None
+                
+                    # Check if this stealth transaction belongs to us
+                    if is_coinbase or self.ring_system.recover_stealth_address(R, P, self.account.view_sk, self.spend_pk):
+                        # Found a stealth transaction for us! Decrypt it
+                        if tx.get('amount') != None:
+                            amount = tx.get('amount')
+                        else:
+                            ciphertext = reconstruct_ciphertext_from_dict(tx, self.ring_system.curve)
+                            amount = self.ring_system.twisted_elgamal_decrypt(ciphertext, self.account.view_sk)
 
-                    # Update account
-                    self.account.balance += amount
-                    self.account.received_funds.append((amount, R, P))
+                        # Update account
+                        self.account.balance += amount
+                        self.account.received_funds.append((amount, R, P))
     
-                    self.transactions.append({
-                        'type': 'receive',
-                        'sender_address': tx.get('sender_address'),
-                        'amount': amount,
-                        'tx_id': tx.get('tx_id'),
-                        'timestamp': tx.get('timestamp', time.time())
-                    })
-                    print(f"{self.name} received {amount} coins via stealth address")
+                        self.transactions.append({
+                            'type': 'receive',
+                            'sender_address': tx.get('sender_address'),
+                            'amount': amount,
+                            'tx_id': tx.get('tx_id'),
+                            'timestamp': tx.get('timestamp', time.time())
+                        })
+                        _log.info("%s received %s coins via stealth address", self.name, amount)
 
-                    self.spent_nullifiers.add(tx.get('tx_id'))
+                        self.spent_nullifiers.add(tx_key)
 
-            except Exception as e:
-                print(f"Failed to process TX {tx['tx_id']}: {e}")
-                continue
+                except Exception as e:
+                    _log.error("Failed to process TX %s: %s", tx['tx_id'], e)
+                    continue
+        
+            self._last_scanned_block = max(self._last_scanned_block, tip)
     
     def print_status(self):
         """Print wallet status."""
@@ -257,4 +285,4 @@ class RingBlockchainWallet:
 
     def _on_block_mined(self, block) -> None:
         """Handle new block event."""
-        self.scan_for_transactions()
+        self.scan_for_transactions(since=self._last_scanned_block)
@@ -1,50 +1,271 @@
+import os
 import time
+import logging
+import json
 import threading
 import hashlib
 import random
+import heapq
+import itertools
+import queue
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from operator import itemgetter
 from tinyec.ec import Point
-from tinyec import registry
-from typing import List, Dict, Any, Optional, Callable, Union
+from typing import List, Dict, Any, Optional, Callable, Union, Tuple
 from blockchain.base import Blockchain, Block
+from utils.merkle import transaction_hash
+from constants import TX_VERIFY_CACHE_SIZE, NOTIFY_POOL_WORKERS, PUBKEY_POOL_SIZE, MEMPOOL_SHARDS, FIXED_BASE_WINDOW
+from utils.rwlock import RWLock
+from utils.math_helpers import get_curve, generator_table, fixed_base_mul
+
+_log = logging.getLogger(__name__)
+
+_COINBASE_PREFIX = b"COINBASE:"
 
 class BlockchainStateManager:
-    """Manages blockchain state and provides thread-safe access."""
-    def __init__(self):
+    """Manages blockchain state and provides thread-safe access.
+    
+    Listener callbacks run synchronously on the thread that raised the event.
+    Pass async_listeners=True to run them on a background pool instead; callers
+    then use wait_for_listeners() to wait for them.
+    """
+    def __init__(self, async_listeners: bool = False):
         self.blockchain = Blockchain()
-        self.lock = threading.RLock()
-        self.listeners = []  # Callbacks for state changes
-        self.mempool = []    # Transactions waiting to be included in blocks
+        self.lock = RWLock()  # Queries take the read side, mutations the write side
+        self.listeners: Dict[str, List[Callable]] = defaultdict(list)  # event type -> callbacks
+        # Transactions waiting to be included in blocks, sharded by recipient
+        # address as (arrival sequence, tx) so adds to different shards don't
+        # contend. The mempool property merges them back in arrival order
+        self._mempool_shards: List[List[Tuple[int, Dict[str, Any]]]] = [[] for _ in range(MEMPOOL_SHARDS)]
+        self._mempool_locks = [threading.Lock() for _ in range(MEMPOOL_SHARDS)]
+        self._mempool_seq = itertools.count()
         self.scanning_frequency = 10  # seconds
         self._scanning_thread = None
         self._running = False
+        # Signalled whenever the mempool or chain changes. It has its own lock,
+        # always taken after (never while waiting for) the state lock
+        self._cond = threading.Condition()
+        self._state_version = 0
+        self.transaction_verifier = None  # Optional batch check applied when mining
+        self._verify_pool = None  # Long-lived executor shared by verifiers, see verify_pool
+        self.async_listeners = async_listeners
+        self._notify_pool = None  # Runs listener callbacks off the caller's thread when async
+        self._pending_callbacks = set()  # Futures of callbacks that have not finished yet
+        self._pool_lock = threading.Lock()  # Guards lazy creation of both pools
+        # transaction hash -> verification result. It has its own lock because
+        # pool workers fill it while mine_block holds the write side
+        self._verify_cache: Dict[str, bool] = {}
+        self._verify_cache_lock = threading.Lock()
+        
+        # address -> transactions, for confirmed blocks and for the mempool
+        self._addr_index: Dict[str, List[Dict[str, Any]]] = {}
+        self._addr_index_height = 0      # Number of chain blocks already indexed
+        self._addr_index_tip = None      # Hash of the last indexed block
+        # One mempool index per shard, holding the addresses that hash to it
+        self._mempool_addr_index: List[Dict[str, List[Dict[str, Any]]]] = [{} for _ in range(MEMPOOL_SHARDS)]
+        self._index_lock = threading.Lock()  # Readers may catch the index up concurrently
         
         # Keep track of public keys for ring signatures
-        self.public_keys_registry = []
+        # (curve name, x, y) -> Point; tinyec points are not hashable
+        self.public_keys_registry: Dict[tuple, Point] = {}
+        self._pubkey_pools: Dict[str, queue.Queue] = {}  # curve name -> pregenerated decoy keys
+    
+    def add_transaction(self, transaction: Union[Dict[str, Any], Any]) -> bool:
+        """Add transaction to mempool in thread-safe manner.
+        
+        Transaction objects are converted with to_dict() here, once, so
+        everything stored in the mempool and chain is a plain dict.
+        """
+        if not isinstance(transaction, dict):
+            transaction = transaction.to_dict()
+        # The read side only keeps mining and reloads out; the shard locks
+        # serialize adds that land in the same shard
+        with self.lock.read_lock():
+            seq = next(self._mempool_seq)
+            sender = transaction.get('sender_address')
+            recipient = transaction.get('recipient_address')
+            shard = self._shard(recipient)
+            with self._mempool_locks[shard]:
+                self._mempool_shards[shard].append((seq, transaction))
+            for address in (sender, recipient) if sender != recipient else (recipient,):
+                if address is None:
+                    continue
+                shard = self._shard(address)
+                with self._mempool_locks[shard]:
+                    self._mempool_addr_index[shard].setdefault(address, []).append(transaction)
+        self._state_changed()
+        return True
+    
+    @staticmethod
+    def _shard(address: Optional[str]) -> int:
+        return hash(address) % MEMPOOL_SHARDS
+    
+    @property
+    def mempool(self) -> List[Dict[str, Any]]:
+        """Snapshot of all mempool transactions in arrival order."""
+        shards = []
+        for lock, shard in zip(self._mempool_locks, self._mempool_shards):
+            with lock:
+                shards.append(list(shard))
+        return [tx for _, tx in heapq.merge(*shards, key=itemgetter(0))]
+    
+    def _mempool_size(self) -> int:
+        return sum(len(shard) for shard in self._mempool_shards)
     
-    def add_transaction(self, transaction: Dict[str, Any]) -> bool:
-        """Add transaction to mempool in thread-safe manner."""
-        with self.lock:
-            self.mempool.append(transaction)
-            return True
+    def _reset_mempool(self) -> None:
+        """Empty the mempool. Callers hold the write lock."""
+        self._mempool_shards = [[] for _ in range(MEMPOOL_SHARDS)]
+        self._mempool_addr_index = [{} for _ in range(MEMPOOL_SHARDS)]
+    
+    def reset(self) -> None:
+        """Start over with a fresh chain and an empty mempool, in place.
+        
+        The worker pools and decoy key pools are kept. Listeners, the
+        transaction verifier, registered keys and cached verification results
+        belonged to the previous wallets, so they are dropped.
+        """
+        with self.lock.write_lock():
+            self.blockchain = Blockchain()
+            self._reset_mempool()
+            self._addr_index = {}
+            self._addr_index_height = 0
+            self._addr_index_tip = None
+            self.listeners.clear()
+            self.transaction_verifier = None
+            self.public_keys_registry.clear()
+            with self._verify_cache_lock:
+                self._verify_cache.clear()
+            self._sync_addr_index()
+            self._state_changed()
+    
+    def _state_changed(self) -> None:
+        """Record a mempool/chain change and wake the background scanner."""
+        with self._cond:
+            self._state_version += 1
+            self._cond.notify_all()
+    
+    @staticmethod
+    def _index_transaction(index: Dict[str, List[Dict[str, Any]]], tx_dict: Dict[str, Any]) -> None:
+        """Append a transaction under its sender and recipient addresses."""
+        sender = tx_dict.get('sender_address')
+        recipient = tx_dict.get('recipient_address')
+        if sender is not None:
+            index.setdefault(sender, []).append(tx_dict)
+        if recipient is not None and recipient != sender:
+            index.setdefault(recipient, []).append(tx_dict)
+    
+    def _sync_addr_index(self) -> None:
+        """Index blocks appended since the last sync; rebuild if the chain was replaced."""
+        with self._index_lock:
+            chain = self.blockchain.chain
+            height = self._addr_index_height
+            if height > len(chain) or (height and chain[height - 1].hash != self._addr_index_tip):
+                self._addr_index = {}
+                height = 0
+            
+            for block in chain[height:]:
+                for tx in block.transactions:
+                    self._index_transaction(self._addr_index, tx)
+            
+            self._addr_index_height = len(chain)
+            self._addr_index_tip = chain[-1].hash if chain else None
+    
+    def set_transaction_verifier(self, verifier: Optional[Callable[[List[Dict[str, Any]]], List[bool]]]) -> None:
+        """Set a batch verifier that filters mempool transactions before mining.
+        
+        The verifier receives the whole mempool and returns one bool per
+        transaction, e.g. lambda txs: RingTransaction.verify_batch(txs, ring_system).
+        """
+        with self.lock.write_lock():
+            self.transaction_verifier = verifier
+    
+    @property
+    def verify_pool(self) -> ThreadPoolExecutor:
+        """Executor for verifying transactions in parallel, created on first use.
+        
+        It lives as long as the state manager so mining a block doesn't pay
+        for spinning up worker threads each time.
+        """
+        with self._pool_lock:
+            if self._verify_pool is None:
+                self._verify_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+            return self._verify_pool
+    
+    def cached_verification(self, transaction: Dict[str, Any], verify: Callable[[Dict[str, Any]], bool]) -> bool:
+        """Return verify(transaction), running it only the first time a transaction is seen.
+        
+        Results are keyed by the hash of the transaction's full contents rather
+        than its tx_id, which doesn't cover the proofs, so an altered copy of a
+        verified transaction is checked again.
+        """
+        key = transaction_hash(transaction)
+        with self._verify_cache_lock:
+            result = self._verify_cache.get(key)
+        if result is not None:
+            return result
+        
+        result = bool(verify(transaction))
+        with self._verify_cache_lock:
+            self._remember_verification(key, result)
+        return result
+    
+    def cached_verification_many(self, transactions: List[Dict[str, Any]],
+                                 verify_many: Callable[[List[Dict[str, Any]]], List[bool]]) -> List[bool]:
+        """cached_verification for a whole list.
+        
+        verify_many receives only the transactions without a cached result,
+        all at once, so it can hand them to a pool in one go; it returns
+        their results in the same order.
+        """
+        keys = [transaction_hash(tx) for tx in transactions]
+        with self._verify_cache_lock:
+            results = [self._verify_cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            fresh = verify_many([transactions[i] for i in missing])
+            with self._verify_cache_lock:
+                for i, result in zip(missing, fresh):
+                    results[i] = bool(result)
+                    self._remember_verification(keys[i], results[i])
+        return results
+    
+    def _remember_verification(self, key: str, result: bool) -> None:
+        """Store a verification result; the caller holds _verify_cache_lock."""
+        if len(self._verify_cache) >= TX_VERIFY_CACHE_SIZE:
+            # Evict the oldest entry
+            self._verify_cache.pop(next(iter(self._verify_cache)), None)
+        self._verify_cache[key] = result
     
     def mine_block(self, miner_address: str) -> Optional[Block]:
         """Mine a block with transactions from mempool."""
-        with self.lock:
+        with self.lock.write_lock():
+            mempool = self.mempool
+            
+            # Validate the whole mempool in one batch and drop invalid transactions
+            if self.transaction_verifier and mempool:
+                results = self.transaction_verifier(mempool)
+                valid = [tx for tx, ok in zip(mempool, results) if ok]
+                if len(valid) != len(mempool):
+                    _log.warning("Dropped %d invalid transaction(s) from mempool", len(mempool) - len(valid))
+                mempool = valid
+            
             # Move transactions from mempool to blockchain pending
-            for tx in self.mempool:
+            for tx in mempool:
                 self.blockchain.add_transaction(tx)
-            self.mempool = []
+            self._reset_mempool()
 
             timestamp = time.time()
 
             # Create a mining reward transaction
-            data = f"COINBASE:{miner_address}:{timestamp}"
-            tx_id = hashlib.sha256(data.encode()).hexdigest()[:16]
+            h = hashlib.sha256(_COINBASE_PREFIX)
+            h.update(f"{miner_address}:{timestamp}".encode())
+            tx_id = h.hexdigest()[:16]
             reward_tx = {
                 'sender_address': 'COINBASE',
                 'recipient_address': miner_address,
                 'amount': 1,
-                'timestamp': time.time(),
+                'timestamp': timestamp,
                 'tx_id': tx_id
             }
 
@@ -53,6 +274,8 @@ class BlockchainStateManager:
                 
             # Mine the block
             new_block = self.blockchain.mine_pending_transactions()
+            self._sync_addr_index()
+            self._state_changed()
             
             # Notify listeners if block was mined
             if new_block:
@@ -60,64 +283,182 @@ class BlockchainStateManager:
             
             return new_block
     
+    def start_background_scanning(self) -> None:
+        """Start a thread that emits 'state_changed' events as the state changes."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._scanning_thread = threading.Thread(target=self._scanning_loop, daemon=True)
+            self._scanning_thread.start()
+    
+    def stop_background_scanning(self) -> None:
+        """Stop the background scanner and wait for its thread and any
+        queued listener callbacks to finish."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._scanning_thread is not None:
+            self._scanning_thread.join()
+            self._scanning_thread = None
+        with self._pool_lock:
+            pool, self._notify_pool = self._notify_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    def wait_for_listeners(self) -> None:
+        """Block until every listener callback dispatched so far has run.
+        
+        Only needed with async_listeners; synchronous callbacks have already
+        finished when the event call returns.
+        """
+        with self._pool_lock:
+            pending = list(self._pending_callbacks)
+        wait(pending)
+    
+    def _scanning_loop(self) -> None:
+        """Sleep until the mempool or chain changes, then notify listeners.
+        
+        scanning_frequency only bounds how long a wait may last; the thread
+        does no work while nothing changes.
+        """
+        seen_version = self._state_version
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: not self._running or self._state_version != seen_version,
+                                    timeout=self.scanning_frequency)
+                if not self._running:
+                    return
+                if self._state_version == seen_version:
+                    continue
+                seen_version = self._state_version
+            
+            # Read the state and call listeners outside the condition, so a
+            # writer signalling a change is never blocked behind this thread
+            self._notify_listeners('state_changed', self.get_state_summary())
+    
+    def save_state(self, filename: str) -> None:
+        """Save the blockchain to `filename` plus a public-key sidecar file.
+        
+        The sidecar (`filename` + '.cache') is JSON holding the public key
+        registry, which the chain file does not carry.
+        """
+        with self.lock.read_lock():
+            self.blockchain.save_to_file(filename)
+            snapshot = {
+                'public_keys': [(pk.curve.name, pk.x, pk.y) for pk in self.public_keys_registry.values()],
+            }
+            with open(filename + '.cache', 'w') as file:
+                json.dump(snapshot, file)
+    
+    def load_state(self, filename: str) -> None:
+        """Load a blockchain saved with save_state and rebuild the address index.
+        
+        Public keys are restored from the sidecar when it is present and
+        readable; malformed entries are skipped.
+        """
+        blockchain = Blockchain.load_from_file(filename)
+        snapshot = None
+        cache_path = filename + '.cache'
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path) as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError):
+                snapshot = None
+        public_keys = snapshot.get('public_keys') if isinstance(snapshot, dict) else None
+        
+        with self.lock.write_lock():
+            self.blockchain = blockchain
+            self._addr_index = {}
+            self._addr_index_height = 0
+            self._addr_index_tip = None
+            
+            for entry in public_keys if isinstance(public_keys, list) else []:
+                try:
+                    curve_name, x, y = entry
+                    self.register_public_key(Point(get_curve(curve_name), x, y))
+                except (TypeError, ValueError):
+                    continue
+            
+            self._sync_addr_index()
+            self._state_changed()
+    
     def scan_for_address(self, address: str) -> List[Dict[str, Any]]:
         """Scan blockchain for transactions involving address."""
-        with self.lock:
+        with self.lock.read_lock():
             return self.blockchain.scan_for_transactions(address)
     
     def add_listener(self, event_type: str, callback: Callable) -> None:
         """Add a callback function for blockchain events."""
-        self.listeners.append((event_type, callback))
+        self.listeners[event_type].append(callback)
     
     def _notify_listeners(self, event_type: str, data: Any) -> None:
-        """Notify all registered listeners of an event."""
-        for listener_type, callback in self.listeners:
-            if listener_type == event_type:
-                callback(data)
+        """Notify all registered listeners of an event.
+        
+        Callbacks run in order on the calling thread unless async_listeners is
+        set, in which case they go to a small thread pool so a slow listener
+        (e.g. a wallet rescanning after a block) never holds up mining. An
+        async callback that reads state waits for the caller to release the
+        state lock first.
+        """
+        callbacks = self.listeners.get(event_type)
+        if not callbacks:
+            return
+        if not self.async_listeners:
+            for callback in list(callbacks):
+                self._run_listener(event_type, callback, data)
+            return
+        with self._pool_lock:
+            if self._notify_pool is None:
+                self._notify_pool = ThreadPoolExecutor(max_workers=NOTIFY_POOL_WORKERS,
+                                                       thread_name_prefix='bc-notify')
+            futures = [self._notify_pool.submit(self._run_listener, event_type, callback, data)
+                       for callback in callbacks]
+            self._pending_callbacks.update(futures)
+        # Attached outside the lock: a finished future runs the callback inline
+        for future in futures:
+            future.add_done_callback(self._callback_done)
+    
+    def _callback_done(self, future) -> None:
+        with self._pool_lock:
+            self._pending_callbacks.discard(future)
+    
+    @staticmethod
+    def _run_listener(event_type: str, callback: Callable, data: Any) -> None:
+        try:
+            callback(data)
+        except Exception as e:
+            _log.error("Error in '%s' listener: %s", event_type, e)
 
     def get_state_summary(self) -> Dict[str, Any]:
         """Get a summary of current blockchain state."""
-        with self.lock:
+        with self.lock.read_lock():
             last_block_hash = self.blockchain.chain[-1].hash if self.blockchain.chain[-1] else "N/A"
             
             return {
                 'chain_length': len(self.blockchain.chain),
                 'last_block_hash': last_block_hash,
                 'pending_transactions': len(self.blockchain.pending_transactions),
-                'mempool_size': len(self.mempool),
+                'mempool_size': self._mempool_size(),
                 'difficulty': self.blockchain.difficulty
             }
     
     def get_transactions_for_address(self, address: str) -> List[Dict[str, Any]]:
         """Get all transactions involving a given address."""
-        all_txs = []
-        
-        # Look in blocks
-        with self.lock:
-            for block in self.blockchain.chain:
-                for tx in block.transactions:
-                    if isinstance(tx, dict):
-                        if tx.get('sender_address') == address or tx.get('recipient_address') == address:
-                            all_txs.append(tx)
-                    else:
-                        # Handle non-dict transactions
-                        tx_dict = tx if isinstance(tx, dict) else getattr(tx, 'to_dict', lambda: {})()
-                        if isinstance(tx_dict, dict):
-                            if tx_dict.get('sender_address') == address or tx_dict.get('recipient_address') == address:
-                                all_txs.append(tx_dict)
-        
-        # Also check pending transactions
-        with self.lock:
-            for tx in self.blockchain.pending_transactions + self.mempool:
-                if isinstance(tx, dict):
-                    if tx.get('sender_address') == address or tx.get('recipient_address') == address:
-                        all_txs.append(tx)
-                else:
-                    # Handle non-dict transactions
-                    tx_dict = tx if isinstance(tx, dict) else getattr(tx, 'to_dict', lambda: {})()
-                    if isinstance(tx_dict, dict):
-                        if tx_dict.get('sender_address') == address or tx_dict.get('recipient_address') == address:
-                            all_txs.append(tx_dict)
+        with self.lock.read_lock():
+            # Confirmed transactions from the address index
+            self._sync_addr_index()
+            all_txs = list(self._addr_index.get(address, ()))
+            
+            # Also check pending transactions (normally empty between blocks)
+            for tx in self.blockchain.pending_transactions:
+                if tx.get('sender_address') == address or tx.get('recipient_address') == address:
+                    all_txs.append(tx)
+            
+            shard = self._shard(address)
+            with self._mempool_locks[shard]:
+                all_txs.extend(self._mempool_addr_index[shard].get(address, ()))
         
         return all_txs
     
@@ -125,53 +466,86 @@ class BlockchainStateManager:
         """Get all transactions in the blockchain and mempool."""
         all_txs = []
         
-        # Look in blocks
-        with self.lock:
+        with self.lock.read_lock():
+            # Look in blocks
             for block in self.blockchain.chain:
-                for tx in block.transactions:
-                    if isinstance(tx, dict):
-                        all_txs.append(tx)
-                    else:
-                        # Handle non-dict transactions
-                        tx_dict = tx if isinstance(tx, dict) else getattr(tx, 'to_dict', lambda: {})()
-                        if isinstance(tx_dict, dict):
-                            all_txs.append(tx_dict)
-        
-        # Also check pending transactions
-        with self.lock:
-            for tx in self.blockchain.pending_transactions + self.mempool:
-                if isinstance(tx, dict):
-                    all_txs.append(tx)
-                else:
-                    # Handle non-dict transactions
-                    tx_dict = tx if isinstance(tx, dict) else getattr(tx, 'to_dict', lambda: {})()
-                    if isinstance(tx_dict, dict):
-                        all_txs.append(tx_dict)
+                all_txs.extend(block.transactions)
+            
+            # Also check pending transactions
+            all_txs.extend(self.blockchain.pending_transactions)
+            all_txs.extend(self.mempool)
         
         return all_txs
     
+    def get_transactions_since(self, block_index: int) -> List[Dict[str, Any]]:
+        """Get transactions in blocks after block_index, plus pending and mempool."""
+        new_txs = []
+        
+        with self.lock.read_lock():
+            for block in self.blockchain.chain[block_index + 1:]:
+                new_txs.extend(block.transactions)
+            
+            new_txs.extend(self.blockchain.pending_transactions)
+            new_txs.extend(self.mempool)
+        
+        return new_txs
+    
+    def get_latest_block_index(self) -> int:
+        """Get the index of the most recent block."""
+        with self.lock.read_lock():
+            return self.blockchain.get_latest_block().index
+    
+    @staticmethod
+    def _point_key(point: Point) -> tuple:
+        return (point.curve.name, point.x, point.y)
+    
     def register_public_key(self, public_key: Point) -> None:
         """Register a public key for ring signatures."""
-        if public_key not in self.public_keys_registry:
-            self.public_keys_registry.append(public_key)
+        self.public_keys_registry.setdefault(self._point_key(public_key), public_key)
+    
+    def _pubkey_pool(self, curve_name: str) -> queue.Queue:
+        """Queue of throwaway public keys for curve_name, filled by a daemon thread
+        that is started on first use."""
+        with self._pool_lock:
+            pool = self._pubkey_pools.get(curve_name)
+            if pool is None:
+                pool = queue.Queue(maxsize=PUBKEY_POOL_SIZE)
+                self._pubkey_pools[curve_name] = pool
+                threading.Thread(target=self._fill_pubkey_pool, args=(pool, get_curve(curve_name)),
+                                 name=f'pk-pool-{curve_name}', daemon=True).start()
+            return pool
+    
+    @staticmethod
+    def _random_public_key(curve) -> Point:
+        """Public key for a fresh random private key, via the cached generator table."""
+        random_priv = random.randint(1, curve.field.n - 1)
+        return fixed_base_mul(random_priv, generator_table(curve.name, FIXED_BASE_WINDOW), FIXED_BASE_WINDOW)
+    
+    @staticmethod
+    def _fill_pubkey_pool(pool: queue.Queue, curve) -> None:
+        # put() blocks while the pool is full, so the thread idles until keys are taken
+        while True:
+            pool.put(BlockchainStateManager._random_public_key(curve))
     
     def get_random_public_keys(self, n: int, exclude: List[Point] = None, curve_name: str = 'secp192r1') -> List[Point]:
         """Get random public keys from registry or generate new ones if needed.
         Used for ring signatures to create anonymity set."""
-        exclude = exclude or []
+        excluded = {self._point_key(pk) for pk in exclude or ()}
         
         # Filter out excluded keys
-        available_keys = [pk for pk in self.public_keys_registry if pk not in exclude]
+        available_keys = [pk for key, pk in self.public_keys_registry.items() if key not in excluded]
         
-        # Generate additional keys if needed
+        # Take additional keys from the background pool, generating inline if it runs dry
         if len(available_keys) < n:
-            curve = registry.get_curve(curve_name)
+            curve = get_curve(curve_name)
+            pool = self._pubkey_pool(curve_name)
             for _ in range(n - len(available_keys)):
-                # Generate a random private key
-                random_priv = random.randint(1, curve.field.n - 1)
-                random_pub = random_priv * curve.g
+                try:
+                    random_pub = pool.get_nowait()
+                except queue.Empty:
+                    random_pub = self._random_public_key(curve)
                 available_keys.append(random_pub)
-                self.public_keys_registry.append(random_pub)
+                self.register_public_key(random_pub)
         
         # Select random subset
         selected = random.sample(available_keys, min(n, len(available_keys)))
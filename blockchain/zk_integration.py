@@ -1,47 +1,93 @@
 import time
+import logging
+import threading
 import hashlib
 import json
+import os
+import pickle
+import multiprocessing
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, List, Optional
 
-from .base import Blockchain
+from .base import Blockchain, tx_id_key
 from .state_manager import BlockchainStateManager
-import sys
-import os
-
-# Add the parent directory to the path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from zkp.zk_pedersen_elgamal import ZKPedersenElGamal, ZKAccount, ZKPoint
-from tinyec import registry
 from tinyec.ec import Point
 
-from utils.math_helpers import safe_equals
+from utils.math_helpers import safe_equals, get_curve
+from constants import WALLET_SCAN_PARALLEL_MIN_TXS, PROOF_POOL_MIN_TXS
+
+_log = logging.getLogger(__name__)
+
+_CIPHERTEXT_COORDS = itemgetter('ciphertext_c1_x', 'ciphertext_c1_y', 'ciphertext_c2_x', 'ciphertext_c2_y')
+
+@lru_cache(maxsize=4096)
+def _pk_to_addr(x: int, y: int) -> str:
+    """Address string for a public key; formatting the big coordinates is not free."""
+    return f"{x}:{y}"
+
+# Each verification worker process builds its own proof system once
+_worker_zk_system = None
+
+def _init_verify_worker(curve_name: str, verbose: bool) -> None:
+    global _worker_zk_system
+    _worker_zk_system = ZKPedersenElGamal(curve_name=curve_name, verbose=verbose)
+
+def _verify_in_worker(tx_dict: Dict[str, Any]) -> bool:
+    try:
+        return ZKTransaction.verify_transaction(tx_dict, _worker_zk_system)
+    except Exception as e:
+        _log.error("Error verifying transaction: %s", e)
+        return False
+
+def verify_process_pool(curve_name: str, max_workers: Optional[int] = None,
+                        verbose: bool = True) -> ProcessPoolExecutor:
+    """Process pool for ZKTransaction.verify_batch, so proof checks run outside the GIL.
+    
+    Workers are spawned rather than forked because the callers (the state
+    manager and console) already run threads whose locks a fork would copy.
+    verbose is passed on to each worker's ZKPedersenElGamal.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_verify_worker,
+        initargs=(curve_name, verbose),
+    )
 
 def reconstruct_ciphertext_from_dict(data, curve_name='secp192r1'):
-    curve = registry.get_curve(curve_name)
-    c1 = Point(curve, data['ciphertext_c1_x'], data['ciphertext_c1_y'])
-    c2 = Point(curve, data['ciphertext_c2_x'], data['ciphertext_c2_y'])
-    return (c1, c2)
+    curve = get_curve(curve_name)
+    c1_x, c1_y, c2_x, c2_y = _CIPHERTEXT_COORDS(data)
+    return (Point(curve, c1_x, c1_y), Point(curve, c2_x, c2_y))
 
 class ZKTransaction:
     """A zero-knowledge transaction that can be added to the blockchain."""
-    def __init__(self, sender_pk, recipient_pk, ciphertext, amount_proof, balance_proof, signature, sender_address=None, recipient_address=None):
+    __slots__ = ('sender_pk', 'recipient_pk', 'ciphertext', 'amount_proof', 'balance_proof', 'signature',
+                 'timestamp', 'sender_address', 'recipient_address', '_id_prefix', 'tx_id')
+    
+    def __init__(self, sender_pk, recipient_pk, ciphertext, amount_proof, balance_proof, signature, sender_address=None, recipient_address=None, timestamp=None):
         self.sender_pk = sender_pk
         self.recipient_pk = recipient_pk
         self.ciphertext = ciphertext
         self.amount_proof = amount_proof
         self.balance_proof = balance_proof
         self.signature = signature
-        self.timestamp = time.time()
-        self.sender_address = sender_address or f"{self.sender_pk.x}:{self.sender_pk.y}"
-        self.recipient_address = recipient_address or f"{self.recipient_pk.x}:{self.recipient_pk.y}"
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.sender_address = sender_address or _pk_to_addr(self.sender_pk.x, self.sender_pk.y)
+        self.recipient_address = recipient_address or _pk_to_addr(self.recipient_pk.x, self.recipient_pk.y)
+        self._id_prefix = f"{self.sender_address}:{self.recipient_address}:".encode()
         self.tx_id = self._generate_tx_id()
     
     def _generate_tx_id(self) -> str:
         """Generate a unique transaction ID."""
         # In a real system, this would use more sophisticated ID generation
-        data = f"{self.sender_address}:{self.recipient_address}:{self.timestamp}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        h = hashlib.sha256(self._id_prefix)
+        h.update(str(self.timestamp).encode())
+        return h.hexdigest()[:16]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert transaction to serializable dict for blockchain storage."""
@@ -61,31 +107,87 @@ class ZKTransaction:
         }
     
     @staticmethod
-    def verify_transaction(tx_dict: Dict[str, Any], zk_system: ZKPedersenElGamal) -> bool:
-        """Verify transaction validity without knowing the amount."""
+    def verify_transaction(tx_dict: Dict[str, Any], zk_system: ZKPedersenElGamal,
+                           state_manager: Optional[BlockchainStateManager] = None) -> bool:
+        """Verify transaction validity without knowing the amount.
+        
+        With a state_manager, the result is shared through its verification
+        cache so each transaction's proofs are checked only once.
+        """
         if tx_dict.get("sender_address") == "COINBASE":
             return True
 
+        if state_manager is not None:
+            return state_manager.cached_verification(tx_dict, zk_system.verify_zk_transaction)
         return zk_system.verify_zk_transaction(tx_dict)
 
+    @staticmethod
+    def verify_batch(tx_dicts: List[Dict[str, Any]], zk_system: ZKPedersenElGamal,
+                     pool: Optional[Executor] = None,
+                     state_manager: Optional[BlockchainStateManager] = None) -> List[bool]:
+        """Verify a batch of transactions, spreading them over `pool` if given.
+        
+        `pool` may be a thread pool or a process pool from verify_process_pool;
+        batches smaller than PROOF_POOL_MIN_TXS, or ones the process pool
+        breaks on or can't pickle, are verified in this process instead.
+        """
+        if isinstance(pool, ProcessPoolExecutor):
+            def verify_many(batch):
+                if len(batch) < PROOF_POOL_MIN_TXS:
+                    return ZKTransaction.verify_batch(batch, zk_system)
+                try:
+                    return list(pool.map(_verify_in_worker, batch))
+                except (OSError, BrokenProcessPool, pickle.PicklingError):
+                    return ZKTransaction.verify_batch(batch, zk_system)
+            
+            if state_manager is not None:
+                return state_manager.cached_verification_many(tx_dicts, verify_many)
+            return verify_many(tx_dicts)
+        
+        def verify(tx_dict):
+            try:
+                return ZKTransaction.verify_transaction(tx_dict, zk_system, state_manager)
+            except Exception as e:
+                _log.error("Error verifying transaction: %s", e)
+                return False
+        
+        if pool is None or len(tx_dicts) < 2:
+            return [verify(tx_dict) for tx_dict in tx_dicts]
+        return list(pool.map(verify, tx_dicts))
+
 
 class ZKBlockchainWallet:
-    """Wallet that interacts with blockchain using zero-knowledge proofs."""
-    def __init__(self, zk_system: ZKPedersenElGamal, blockchain: BlockchainStateManager, name: Optional[str] = None):
+    """Wallet that interacts with blockchain using zero-knowledge proofs.
+    
+    Outgoing transactions are not verified by the sender; their proofs are
+    checked when the block is mined and again by the recipient's scan. Pass
+    debug=True to also verify each transaction before it is submitted.
+    """
+    __slots__ = ('zk_system', 'blockchain', 'debug', 'account', 'scanning_interval', 'address',
+                 'spent_nullifiers', '_scan_lock')
+    
+    def __init__(self, zk_system: ZKPedersenElGamal, blockchain: BlockchainStateManager, name: Optional[str] = None,
+                 debug: bool = False):
         self.zk_system = zk_system
         self.blockchain = blockchain
+        self.debug = debug
         self.account = ZKAccount(zk_system, name)
         self.scanning_interval = 5  # seconds
-        self.address = f"{self.account.pk.x}:{self.account.pk.y}"
-        self.spent_nullifiers = set()
+        self.address = _pk_to_addr(self.account.pk.x, self.account.pk.y)
+        self.spent_nullifiers = set()  # tx_id_key() of processed transactions
+        self._scan_lock = threading.Lock()  # Scans may come from listener threads
         
         # Register for blockchain events
         self.blockchain.add_listener('block_mined', self._on_block_mined)
     
-    def send_transaction(self, recipient, amount: float) -> bool:
-        """Send private transaction to recipient via blockchain."""
-        if amount > self.get_balance():
-            print(f"Insufficient balance: {self.get_balance()} < {amount}")
+    def send_transaction(self, recipient, amount: float, known_balance: Optional[float] = None) -> bool:
+        """Send private transaction to recipient via blockchain.
+        
+        known_balance lets a caller that already read the balance skip reading it again.
+        """
+        balance = self.get_balance() if known_balance is None else known_balance
+        if amount > balance:
+            _log.warning("Insufficient balance: %s < %s", balance, amount)
             return False
         
         # Create private transaction with ZK proof
@@ -100,11 +202,12 @@ class ZKBlockchainWallet:
             sender_address=self.address, recipient_address=recipient.address
         )
         
-        if not self.zk_system.verify_zk_transaction(zk_tx.to_dict()):
+        tx_dict = zk_tx.to_dict()
+        if self.debug and not ZKTransaction.verify_transaction(tx_dict, self.zk_system, self.blockchain):
             return False
 
         # Add to blockchain
-        self.blockchain.add_transaction(zk_tx.to_dict())
+        self.blockchain.add_transaction(tx_dict)
         
         # Update local state
         self.account.balance -= amount
@@ -114,40 +217,40 @@ class ZKBlockchainWallet:
             'recipient_address': recipient.address, 
             'amount': amount,
             'tx_id': zk_tx.tx_id,
-            'timestamp': time.time()
+            'timestamp': zk_tx.timestamp
         })
         
-        print(f"{self.account.name} sent {amount} to {recipient.account.name} (TX ID: {zk_tx.tx_id})")
+        _log.info("%s sent %s to %s (TX ID: %s)", self.account.name, amount, recipient.account.name, zk_tx.tx_id)
         return True
     
     def scan_for_transactions(self) -> None:
         """Scan blockchain for incoming transactions."""
-        # Use the full wallet address for scanning
-        transactions = self.blockchain.scan_for_address(self.address)
+        with self._scan_lock:
+            # Use the full wallet address for scanning
+            transactions = self.blockchain.scan_for_address(self.address)
         
-        for tx_info in transactions:
-            tx = tx_info['transaction']
-
-            # Skip already processed transactions
-            if tx.get('tx_id') in self.spent_nullifiers:
-                continue
-            
-            # Check if this transaction is for us using the wallet address
-            if tx.get('recipient_address') == self.address:
-                if not tx.get("sender_address") == "COINBASE":
-                    if not self.zk_system.verify_zk_transaction(tx):
-                        continue
-
-                if tx.get('amount') != None:
-                    amount = tx.get('amount')
-                else:
-                    ciphertext = reconstruct_ciphertext_from_dict(tx)
-                    amount = self.zk_system.constant_time_decrypt(
-                      ciphertext, 
-                      self.account.sk,
-                      None
-                    )
-
+            # Only unprocessed transactions paid to this wallet need any work
+            incoming = {}
+            for tx_info in transactions:
+                tx = tx_info['transaction']
+                if tx.get('recipient_address') != self.address:
+                    continue
+                tx_key = tx_id_key(tx.get('tx_id'))
+                if tx_key in self.spent_nullifiers:
+                    continue
+                incoming.setdefault(tx_key, tx)
+            if not incoming:
+                return
+        
+            # Larger batches are verified and decrypted on the shared pool
+            pool = self.blockchain.verify_pool if len(incoming) >= WALLET_SCAN_PARALLEL_MIN_TXS else None
+            txs = list(incoming.values())
+            valid = ZKTransaction.verify_batch(txs, self.zk_system, pool, self.blockchain)
+            received = [(tx_key, tx) for (tx_key, tx), ok in zip(incoming.items(), valid) if ok]
+            txs = [tx for _, tx in received]
+            amounts = list(pool.map(self._decrypt_amount, txs)) if pool else [self._decrypt_amount(tx) for tx in txs]
+        
+            for (tx_key, tx), amount in zip(received, amounts):
                 # Update local state with more data
                 sender_display = tx.get('sender_address', '').split(':')[0][:8]
                 self.account.balance += amount
@@ -159,11 +262,17 @@ class ZKBlockchainWallet:
                     'tx_id': tx.get('tx_id'),
                     'timestamp': tx.get('timestamp', time.time())
                 })
-                
+            
                 # Mark as processed
-                self.spent_nullifiers.add(tx.get('tx_id'))
-                
-                print(f"{self.account.name} received {amount} (TX ID: {tx.get('tx_id')})")
+                self.spent_nullifiers.add(tx_key)
+            
+                _log.info("%s received %s (TX ID: %s)", self.account.name, amount, tx.get('tx_id'))
+    
+    def _decrypt_amount(self, tx: Dict[str, Any]):
+        """Plaintext amount of a transaction, decrypting the ciphertext only if needed."""
+        if tx.get('amount') is not None:
+            return tx['amount']
+        return self.zk_system.constant_time_decrypt_from_ints(*_CIPHERTEXT_COORDS(tx), self.account.sk)
     
     def get_balance(self) -> float:
         """Get wallet balance."""
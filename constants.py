@@ -3,12 +3,18 @@ Common constants for the homomorphic encryption demo project.
 All magic numbers and constants from across the codebase are centralized here.
 """
 
+import os
+
 # Cryptographic constants
 PEDERSEN_H_GENERATOR_SEED = b"PEDERSEN_H_GENERATOR"
 
 # Table size constants
 TABLE_MAX = 10000  # Max size for lookup tables in pedersen_elgamal.py
 MAX_VALUE_RANGE = 10000  # Max range for value lookups in zk_pedersen_elgamal.py
+VALUE_TABLE_CACHE_DIR = "~/.cache/zkped"  # Where generated value tables are stored between runs
+VALUE_TABLE_CACHE_VERSION = 2  # Bump when the table layout changes so stale cache files are ignored
+VALUE_TABLE_PARALLEL_MIN = 10000  # Smaller value tables are built in-process
+FIXED_BASE_WINDOW = 4  # Bits per window in the precomputed G and H multiplication tables
 
 # Transaction limits
 TX_MAX_AMOUNT = 10000  # Maximum amount for transactions
@@ -38,4 +44,31 @@ PRIME_GEN_ATTEMPTS = 3       # Number of attempts for prime generation
 PRIME_BIT_LENGTHS = [8, 16, 32, 64, 128, 256, 512, 1024] # Integer sizes (bits) to try for prime generation
 
 # Transaction ID generation
-TX_ID_LENGTH = 8  # Length of transaction ID hash prefix
\ No newline at end of file
+TX_ID_LENGTH = 8  # Length of transaction ID hash prefix
+
+# Proof-of-work mining
+POW_NUMBA_MIN_DIFFICULTY = 5  # Below this the JIT call overhead outweighs the pure-Python loop
+POW_NUMBA_BATCH_SIZE = 1 << 20  # Nonces scanned per compiled kernel call
+
+# Chain verification
+VERIFY_PARALLEL_MIN_BLOCKS = 64  # Fewer blocks than this are checked in-process
+
+# Transaction serialization
+TX_VERIFY_CACHE_SIZE = 8192  # Transaction verification results remembered by the state manager
+RANGE_PROOF_CACHE_SIZE = 1024  # (amount, balance) range-proof results remembered by the live console
+
+# Live console
+CONSOLE_HISTORY_FILE = "~/.cache/zkped/console_history"  # Command history kept between console sessions
+CONSOLE_HISTORY_LENGTH = 1000  # Most recent commands written back to the history file
+
+# State manager
+MEMPOOL_SHARDS = 16  # Independently locked mempool buckets, keyed by recipient address
+NOTIFY_POOL_WORKERS = 4  # Threads that run listener callbacks
+PUBKEY_POOL_SIZE = 1024  # Decoy public keys pregenerated per curve for ring signatures
+
+# Wallet scanning
+WALLET_SCAN_PARALLEL_MIN_TXS = 8  # Incoming transactions needed before a scan uses the verify pool
+PROOF_POOL_MIN_TXS = 8  # Unverified transactions needed before proofs go to worker processes
+
+# Demo pacing
+DEMO_SLEEP = float(os.environ.get("DEMO_SLEEP", "1"))  # Seconds the demos pause between steps; 0 for benchmark runs
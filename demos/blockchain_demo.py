@@ -1,4 +1,5 @@
 import sys
+import logging
 import os
 import time
 import threading
@@ -8,9 +9,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from zkp.zk_pedersen_elgamal import ZKPedersenElGamal
 from blockchain.state_manager import BlockchainStateManager
-from blockchain.zk_integration import ZKBlockchainWallet
+from blockchain.zk_integration import ZKBlockchainWallet, ZKTransaction
+from constants import DEMO_SLEEP
 
-def run_blockchain_demo():
+def run_blockchain_demo(pause=DEMO_SLEEP):
     print("\n==== Zero-Knowledge Blockchain Demo ====\n")
     print("Initializing blockchain with ZK transaction support...")
     
@@ -21,6 +23,11 @@ def run_blockchain_demo():
     # Generate lookup table for fast decryption
     zk_system.generate_value_table(max_range=100)
     
+    # Verify mempool transactions in parallel before they are mined
+    blockchain.set_transaction_verifier(
+        lambda txs: ZKTransaction.verify_batch(txs, zk_system, blockchain.verify_pool, blockchain)
+    )
+    
     # Create wallets
     alice = ZKBlockchainWallet(zk_system, blockchain, "Alice")
     bob = ZKBlockchainWallet(zk_system, blockchain, "Bob")
@@ -39,15 +46,14 @@ def run_blockchain_demo():
     
     print("Alice sends 15 to Bob...")
     alice.send_transaction(bob, 15)
-    time.sleep(0.5)
+    time.sleep(pause / 2)
     
     print("Bob sends 5 to Charlie...")
     bob.send_transaction(charlie, 5)
-    time.sleep(0.5)
+    time.sleep(pause / 2)
     
     print("\nTransactions are now waiting in mempool. Mining a block...")
-    miner_address = f"{miner.account.pk.x}:{miner.account.pk.y}"
-    block = blockchain.mine_block(miner_address)
+    block = blockchain.mine_block(miner.address)
     
     if block:
         print(f"Block mined! Hash: {block.hash[:16]}...")
@@ -76,4 +82,5 @@ def run_blockchain_demo():
     print("\n==== End of Blockchain Demo ====")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     run_blockchain_demo()
@@ -43,6 +43,13 @@ def demonstrate_merkle_tree():
     print(f"\nMerkle Root Hash: {tree.get_root_hash()}")
     print(f"Hash Length: {len(tree.get_root_hash())} characters (SHA-256)")
     
+    # The same tree under BLAKE3, when the blake3 package is installed
+    try:
+        blake3_tree = MerkleTree(transactions, hash_algo='blake3')
+        print(f"BLAKE3 Merkle Root:  {blake3_tree.get_root_hash()}")
+    except ValueError as e:
+        print(f"BLAKE3 Merkle Root:  unavailable ({e})")
+    
     # Select a transaction to verify
     tx_to_verify = transactions[2]
     print(f"\nVerifying transaction #{transactions.index(tx_to_verify)+1}:")
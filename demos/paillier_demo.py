@@ -4,7 +4,7 @@ import os
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from schemes.paillier import generate_keypair, encrypt, decrypt, add_encrypted
+from schemes.paillier import generate_keypair, add_encrypted, batch_encrypt, batch_decrypt
 from constants import PAILLIER_PRIME_P, PAILLIER_PRIME_Q
 
 def run_paillier_demo():
@@ -30,11 +30,11 @@ def run_paillier_demo():
     print("\n==== Paillier Homomorphic Encryption Demo ====\n")
     print(f"Using {len(str(p))}-digit primes for cryptographic security\n")
     
-    for m1, m2 in test_cases:
-        c1 = encrypt(pub_key, m1)
-        c2 = encrypt(pub_key, m2)
-        c_sum = add_encrypted(pub_key, c1, c2)
-        decrypted_sum = decrypt(pub_key, priv_key, c_sum)
+    # Every operand is encrypted under the same key, so do them in one batch
+    ciphertexts = iter(batch_encrypt(pub_key, [m for pair in test_cases for m in pair]))
+    sums = [add_encrypted(pub_key, next(ciphertexts), next(ciphertexts)) for _ in test_cases]
+    
+    for (m1, m2), decrypted_sum in zip(test_cases, batch_decrypt(pub_key, priv_key, sums)):
         print(f"Test case: {m1} + {m2}")
         print(f"Actual sum: {m1 + m2}")
         print(f"Decrypted sum: {decrypted_sum}")
@@ -6,8 +6,9 @@ import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from schemes.pedersen_elgamal import PedersenElGamal, Account
+from constants import DEMO_SLEEP
 
-def run_pedersen_elgamal_demo():
+def run_pedersen_elgamal_demo(pause=DEMO_SLEEP):
     print("\n==== Pedersen Commitment + Twisted ElGamal Encryption Demo ====\n")
     
     # Initialize the cryptographic system
@@ -41,15 +42,15 @@ def run_pedersen_elgamal_demo():
     
     print("Alice sends 20 to Bob...")
     alice.transfer(bob, 20)
-    time.sleep(1)
+    time.sleep(pause)
     
     print("Bob sends 15 to Charlie...")
     bob.transfer(charlie, 15)
-    time.sleep(1)
+    time.sleep(pause)
     
     print("Charlie sends 30 to Alice...")
     charlie.transfer(alice, 30)
-    time.sleep(1)
+    time.sleep(pause)
     
     print("\n=== Final Account Status ===\n")
     
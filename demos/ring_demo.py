@@ -6,8 +6,9 @@ import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from schemes.ring_pedersen_elgamal import RingPedersenElGamal, StealthAccount
+from constants import DEMO_SLEEP
 
-def run_ring_signature_demo():
+def run_ring_signature_demo(pause=DEMO_SLEEP):
     print("\n==== Ring Signature + Stealth Address Demo ====\n")
     
     # Initialize the cryptographic system
@@ -37,13 +38,13 @@ def run_ring_signature_demo():
     print("Alice sends 30 to Bob using stealth address...")
     amount, R, P = alice.send_funds(bob.get_public_address(), 30)
     bob.receive_funds(amount, R, P)
-    time.sleep(1)
+    time.sleep(pause)
     
     # Bob sends funds to Charlie using stealth address
     print("Bob sends 20 to Charlie using stealth address...")
     amount, R, P = bob.send_funds(charlie.get_public_address(), 20)
     charlie.receive_funds(amount, R, P)
-    time.sleep(1)
+    time.sleep(pause)
     
     print("\n=== Testing Ring Signatures ===\n")
     
@@ -6,8 +6,9 @@ import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from zkp.zk_pedersen_elgamal import ZKPedersenElGamal, ZKAccount
+from constants import DEMO_SLEEP
 
-def run_zk_demo():
+def run_zk_demo(pause=DEMO_SLEEP):
     print("\n==== Zero-Knowledge Proof Demo ====\n")
     print("Initializing ZK-enabled cryptographic system...")
     
@@ -35,15 +36,15 @@ def run_zk_demo():
     
     print("Alice sends 100 to Bob with privacy...")
     alice.send(bob, 100)
-    time.sleep(1)
+    time.sleep(pause)
     
     print("Bob sends 50 to Charlie with privacy...")
     bob.send(charlie, 50)
-    time.sleep(1)
+    time.sleep(pause)
     
     print("Charlie sends 25 back to Alice with privacy...")
     charlie.send(alice, 25)
-    time.sleep(1)
+    time.sleep(pause)
     
     print("\n=== Testing Range Proofs ===\n")
     
@@ -7,13 +7,14 @@ and zero-knowledge proofs to prevent negative balances and properly validate tra
 """
 
 import argparse
+import logging
 import os
 import sys
 import threading
-import time
 import cmd
+import inspect
 import json
-import hashlib
+from collections import OrderedDict
 from typing import Optional, Dict, Any, List, Tuple, Union
 
 # Make sure the codebase is in the path
@@ -24,8 +25,20 @@ from zkp.zk_pedersen_elgamal import ZKPedersenElGamal
 from schemes.ring_pedersen_elgamal import RingPedersenElGamal
 from zkp.base import RangeProof
 from blockchain.state_manager import BlockchainStateManager
-from blockchain.zk_integration import ZKBlockchainWallet, ZKTransaction
+from blockchain.zk_integration import ZKBlockchainWallet, ZKTransaction, verify_process_pool
 from blockchain.ring_integration import RingBlockchainWallet, RingTransaction
+from constants import RANGE_PROOF_CACHE_SIZE, CONSOLE_HISTORY_FILE, CONSOLE_HISTORY_LENGTH, PROOF_POOL_MIN_TXS
+
+try:
+    import readline
+except ImportError:
+    readline = None
+
+# Encryption schemes the console can run
+SCHEMES = ('zk-pedersen-elgamal', 'ring-pedersen-elgamal')
+
+# Named positions accepted by show_block
+_BLOCK_ALIASES = {'head': 0, 'tail': -1}
 
 
 class InteractiveBlockchainConsole(cmd.Cmd):
@@ -41,47 +54,63 @@ class InteractiveBlockchainConsole(cmd.Cmd):
     """
     prompt = "blockchain> "
     
-    def __init__(self, encryption_scheme: str = "zk-pedersen-elgamal"):
+    def __init__(self, encryption_scheme: str = "zk-pedersen-elgamal", verbose: bool = True):
         super().__init__()
+        # Quiet consoles skip progress output, for scripted drivers and benchmarks
+        self.verbose = verbose
+        if not verbose:
+            self.intro = None
+        # command name -> bound do_* handler, so onecmd skips cmd.Cmd's parse and getattr
+        self._dispatch = {name[3:]: getattr(self, name) for name in self.get_names() if name.startswith('do_')}
+        self._help_text = self._build_help_text()
         self.encryption_scheme = encryption_scheme
+        # (amount, balance) -> whether a range proof for it verified; most recent last
+        self._rp_cache: "OrderedDict[Tuple[int, int], bool]" = OrderedDict()
+        # Worker processes for mempool proof checks, started on first use
+        self._proof_pool = None
+        # One state manager for the console's lifetime; init_blockchain resets it.
+        # Wallet scans after each block run side by side on its listener pool
+        self.state_manager = BlockchainStateManager(async_listeners=True)
         self.init_blockchain()
     
     def init_blockchain(self):
         """Initialize blockchain with proper setup for selected scheme."""
-        print(f"\nInitializing blockchain with {self.encryption_scheme} encryption scheme...")
+        self.emit(f"\nInitializing blockchain with {self.encryption_scheme} encryption scheme...")
+        self.state_manager.reset()
+        self._rp_cache.clear()
         
         # Initialize the appropriate cryptographic system based on scheme
         if self.encryption_scheme == "zk-pedersen-elgamal":
             try:
-                self.crypto_system = ZKPedersenElGamal(curve_name='secp192r1')
+                self.crypto_system = ZKPedersenElGamal(curve_name='secp192r1', verbose=self.verbose)
                 
                 # Generate lookup table for constant-time decryption
-                print("Generating elgamal value table for transaction verification...")
+                self.emit("Generating elgamal value table for transaction verification...")
                 self.crypto_system.generate_value_table(max_range=10000)
                 
-                # Initialize blockchain state manager
-                self.state_manager = BlockchainStateManager()
+                # Re-check every mempool transaction's proofs in parallel before mining
+                crypto_system, state_manager = self.crypto_system, self.state_manager
+                self.state_manager.set_transaction_verifier(
+                    lambda txs: ZKTransaction.verify_batch(txs, crypto_system, self._mempool_verify_pool(len(txs)), state_manager)
+                )
                 
                 # Setup default wallets with initial balances
                 self.setup_default_wallets_zk()
                 
-                print(f"✓ Blockchain initialized with {self.encryption_scheme} encryption")
+                self.emit(f"✓ Blockchain initialized with {self.encryption_scheme} encryption")
             except Exception as e:
                 print(f"Error initializing blockchain: {str(e)}")
                 sys.exit(1)
                 
         elif self.encryption_scheme == "ring-pedersen-elgamal":
             try:
-                print("Generating elgamal value table for transaction verification...")
-                self.crypto_system = RingPedersenElGamal(curve_name='secp192r1')
-                
-                # Initialize blockchain state manager
-                self.state_manager = BlockchainStateManager()
+                self.emit("Generating elgamal value table for transaction verification...")
+                self.crypto_system = RingPedersenElGamal(curve_name='secp192r1', verbose=self.verbose)
                 
                 # Setup default wallets with initial balances
                 self.setup_default_wallets_ring()
                 
-                print(f"✓ Blockchain initialized with {self.encryption_scheme} encryption")
+                self.emit(f"✓ Blockchain initialized with {self.encryption_scheme} encryption")
             except Exception as e:
                 print(f"Error initializing blockchain: {str(e)}")
                 sys.exit(1)
@@ -99,16 +128,18 @@ class InteractiveBlockchainConsole(cmd.Cmd):
         self.alice = ZKBlockchainWallet(self.crypto_system, self.state_manager, "Alice")
         self.bob = ZKBlockchainWallet(self.crypto_system, self.state_manager, "Bob")
         self.charlie = ZKBlockchainWallet(self.crypto_system, self.state_manager, "Charlie")
+        self._index_wallets()
         
         # Initialize with some balance using blockchain's deposit method
-        print("\nFunding initial wallets...")
+        self.emit("\nFunding initial wallets...")
         self.alice.account.deposit(50)
         self.bob.account.deposit(30)
         self.charlie.account.deposit(20)
         
-        print("Initial wallet status:")
-        self.alice.print_status()
-        self.bob.print_status()
+        if self.verbose:
+            print("Initial wallet status:")
+            self.alice.print_status()
+            self.bob.print_status()
     
     def setup_default_wallets_ring(self):
         """Create default wallets with Ring signature handling."""
@@ -120,37 +151,51 @@ class InteractiveBlockchainConsole(cmd.Cmd):
         self.alice = RingBlockchainWallet(self.crypto_system, self.state_manager, "Alice")
         self.bob = RingBlockchainWallet(self.crypto_system, self.state_manager, "Bob")
         self.charlie = RingBlockchainWallet(self.crypto_system, self.state_manager, "Charlie")
+        self._index_wallets()
         
         # Initialize with some balance
-        print("\nFunding initial wallets...")
+        self.emit("\nFunding initial wallets...")
         self.alice.deposit(50)
         self.bob.deposit(30)
         self.charlie.deposit(20)
         
-        print("Initial wallet status:")
-        self.alice.print_status()
-        self.bob.print_status()
+        if self.verbose:
+            print("Initial wallet status:")
+            self.alice.print_status()
+            self.bob.print_status()
+    
+    def emit(self, *args, **kwargs) -> None:
+        """print() for progress output; does nothing on a quiet console."""
+        if self.verbose:
+            print(*args, **kwargs)
     
-    def _verify_transaction_validity(self, sender_wallet, amount: int) -> bool:
-        """Verify if a transaction is valid using appropriate method."""
+    def _index_wallets(self):
+        """Map lowercase wallet names to the default wallets for command lookups."""
+        self._wallets = {
+            'alice': self.alice,
+            'bob': self.bob,
+            'charlie': self.charlie,
+            'miner': self.miner_wallet,
+        }
+    
+    def _verify_transaction_validity(self, sender_wallet, amount: int) -> Tuple[bool, int]:
+        """Verify if a transaction is valid using appropriate method.
+        
+        Returns (ok, current_balance) so the send can reuse the balance it checked.
+        """
         if self.encryption_scheme == "zk-pedersen-elgamal":
             # Use ZK range proofs for verification
             current_balance = sender_wallet.get_balance()
             
-            try:
-                amount_proof = RangeProof(amount, min_value=0, max_value=current_balance)
-                if not amount_proof.verify():
-                    print("ZK Proof Failed: Amount range verification failed")
-                    return False
-            except ValueError as e:
-                print(f"ZK Proof Failed: {str(e)}")
-                return False
-            
+            # No proof can succeed for an overdraft, so reject it before building one
             if amount > current_balance:
                 print(f"ZK Proof Failed: Insufficient funds ({current_balance} < {amount})")
-                return False
+                return False, current_balance
+            
+            if not self._range_proof_ok(amount, current_balance):
+                return False, current_balance
             
-            return True
+            return True, current_balance
             
         elif self.encryption_scheme == "ring-pedersen-elgamal":
             # For Ring signature, we just check the basic balance
@@ -158,25 +203,119 @@ class InteractiveBlockchainConsole(cmd.Cmd):
             
             if amount <= 0:
                 print("Transaction Failed: Amount must be positive")
-                return False
+                return False, current_balance
             
             if amount > current_balance:
                 print(f"Transaction Failed: Insufficient funds ({current_balance} < {amount})")
-                return False
+                return False, current_balance
             
-            return True
+            return True, current_balance
         
         raise Exception(f"Unknown encryption scheme: {self.encryption_scheme}")
 
+    def _range_proof_ok(self, amount: int, current_balance: int) -> bool:
+        """Check that amount lies in [0, current_balance] with a range proof, reusing past results."""
+        key = (amount, current_balance)
+        cached = self._rp_cache.get(key)
+        if cached is not None:
+            self._rp_cache.move_to_end(key)
+            if not cached:
+                print("ZK Proof Failed: Amount range verification failed")
+            return cached
+        
+        try:
+            amount_proof = RangeProof(amount, min_value=0, max_value=current_balance)
+            ok = amount_proof.verify()
+            if not ok:
+                print("ZK Proof Failed: Amount range verification failed")
+        except ValueError as e:
+            print(f"ZK Proof Failed: {str(e)}")
+            ok = False
+        
+        self._rp_cache[key] = ok
+        if len(self._rp_cache) > RANGE_PROOF_CACHE_SIZE:
+            self._rp_cache.popitem(last=False)
+        return ok
+    
+    def preloop(self):
+        """Load command history from earlier sessions when readline is available."""
+        if readline is None:
+            return
+        try:
+            readline.read_history_file(os.path.expanduser(CONSOLE_HISTORY_FILE))
+        except OSError:
+            pass
+    
+    def postloop(self):
+        """Save command history for the next session."""
+        if readline is None:
+            return
+        path = os.path.expanduser(CONSOLE_HISTORY_FILE)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            readline.set_history_length(CONSOLE_HISTORY_LENGTH)
+            readline.write_history_file(path)
+        except OSError:
+            pass
+    
+    def _complete_wallet(self, text):
+        """Wallet names starting with the text being completed."""
+        text = text.lower()
+        return [name for name in self._wallets if name.startswith(text)]
+    
+    def complete_wallet_status(self, text, line, begidx, endidx):
+        return self._complete_wallet(text)
+    
+    def complete_send(self, text, line, begidx, endidx):
+        # Only the sender and recipient are wallet names; the amount is not
+        if len(line[:begidx].split()) <= 2:
+            return self._complete_wallet(text)
+        return []
+    
+    def precmd(self, line):
+        """Canonicalize each command line once, so every do_* sees trimmed lowercase input."""
+        return line.strip().lower()
+    
+    def _build_help_text(self) -> str:
+        """Command table for do_help, one row per docstring summary line.
+        
+        Each row shows the command's "Usage:" line, or just its name when it
+        takes no arguments. Commands that share a docstring (exit and quit)
+        share a row.
+        """
+        rows: Dict[str, List[str]] = {}
+        for name, handler in self._dispatch.items():
+            summary, _, usage = inspect.cleandoc(handler.__doc__ or '').partition('Usage:')
+            usage = usage.strip().split('\n')[0] or name
+            rows.setdefault(summary.strip().split('\n')[0], []).append(usage)
+        labels = {summary: '/'.join(usages) for summary, usages in rows.items()}
+        width = max(map(len, labels.values()))
+        return "\n".join(f" {label:<{width}}  {summary}" for summary, label in labels.items())
+    
+    def onecmd(self, line):
+        """Run a command through the dispatch table.
+        
+        Lines the table doesn't cover (empty lines, '?', unknown commands)
+        go to cmd.Cmd so they keep its behavior.
+        """
+        command, _, arg = line.partition(' ')
+        handler = self._dispatch.get(command)
+        if handler is None:
+            return super().onecmd(line)
+        self.lastcmd = line
+        return handler(arg.strip())
+    
     def do_mine(self, arg):
         """Mine a new block with pending transactions."""
-        print("\nMining new block...")
+        self.emit("\nMining new block...")
         
         # Use the miner wallet for rewards
         miner_address = self.miner_address
         
         # Mine the block
         block = self.state_manager.mine_block(miner_address)
+        # Let every wallet finish scanning the block before reporting it
+        self.state_manager.wait_for_listeners()
         
         if block:
             self.print_block_summary(block)
@@ -186,63 +325,75 @@ class InteractiveBlockchainConsole(cmd.Cmd):
     def do_status(self, arg):
         """Display the current blockchain status."""
         state = self.state_manager.get_state_summary()
-        print("\n=== Blockchain Status ===")
-        print(f"Chain length: {state['chain_length']} blocks")
-        print(f"Latest block hash: {state['last_block_hash'][:16]}...")
-        print(f"Pending transactions: {state['pending_transactions']}")
-        print(f"Mempool size: {state['mempool_size']}")
-        print(f"Mining difficulty: {state['difficulty']}")
-        print(f"Encryption scheme: {self.encryption_scheme}")
+        print(
+            "\n=== Blockchain Status ===\n"
+            f"Chain length: {state['chain_length']} blocks\n"
+            f"Latest block hash: {state['last_block_hash'][:16]}...\n"
+            f"Pending transactions: {state['pending_transactions']}\n"
+            f"Mempool size: {state['mempool_size']}\n"
+            f"Mining difficulty: {state['difficulty']}\n"
+            f"Encryption scheme: {self.encryption_scheme}"
+        )
+    
+    def do_scheme(self, arg):
+        """Show the encryption scheme, or switch to another one on a fresh chain.
+        Usage: scheme [scheme_name]
+        Schemes: zk-pedersen-elgamal, ring-pedersen-elgamal"""
+        if not arg:
+            print(f"Encryption scheme: {self.encryption_scheme}")
+            return
+        if arg not in SCHEMES:
+            print(f"Unsupported encryption scheme: {arg}")
+            return
+        self.encryption_scheme = arg
+        self.init_blockchain()
+    
+    def complete_scheme(self, text, line, begidx, endidx):
+        return [name for name in SCHEMES if name.startswith(text.lower())]
     
     def do_wallet_status(self, arg):
-        """Display status of a specific wallet by name."""
+        """Display status of a specific wallet by name.
+        Usage: wallet_status <name>"""
         if not arg:
-            print("Usage: wallet_status <wallet_name>")
+            print("Usage: wallet_status <name>")
             return
         
-        wallet_name = arg.strip()
-        
         # Lookup wallet by name
-        if wallet_name.lower() == "alice":
-            self.alice.print_status()
-        elif wallet_name.lower() == "bob":
-            self.bob.print_status()
-        elif wallet_name.lower() == "charlie":
-            self.charlie.print_status()
-        elif wallet_name.lower() == "miner":
-            self.miner_wallet.print_status()
+        wallet = self._get_wallet_by_name(arg)
+        if wallet:
+            wallet.print_status()
         else:
-            print(f"Unknown wallet: {wallet_name}")
+            print(f"Unknown wallet: {arg}")
     
     def do_list_wallets(self, arg):
         # Only visible because this demo simulates having access to all private keys
         """List all available wallets with current balances."""
-        print("\n=== Available Wallets ===")
-        print(f"1. Alice    - Address: {self.alice.address[:16]}... - Balance: {self.alice.get_balance():.2f}")
-        print(f"2. Bob      - Address: {self.bob.address[:16]}... - Balance: {self.bob.get_balance():.2f}")
-        print(f"3. Charlie  - Address: {self.charlie.address[:16]}... - Balance: {self.charlie.get_balance():.2f}")
-        print(f"4. Miner    - Address: {self.miner_wallet.address[:16]}... - Balance: {self.miner_wallet.get_balance():.2f}")
+        # One write for the whole list rather than a flush per wallet
+        lines = ["\n=== Available Wallets ==="]
+        for i, (name, wallet) in enumerate(self._wallets.items(), 1):
+            lines.append(f"{i}. {name.capitalize():<9}- Address: {wallet.address[:16]}... - Balance: {wallet.get_balance():.2f}")
+        print("\n".join(lines))
     
     def do_send(self, arg):
         """Send funds from one wallet to another with verification.
-        Usage: send <sender_name> <recipient_name> <amount>
-        Example: send alice bob 15.5"""
+        Usage: send <sender> <recipient> <amount>
+        Example: send alice bob 15"""
         args = arg.split()
         
         if len(args) != 3:
-            print("Usage: send <sender_name> <recipient_name> <amount>")
+            print("Usage: send <sender> <recipient> <amount>")
             return
         
         sender_name, recipient_name, amount_str = args
         
-        # Convert amount to float with validation
-        try:
-            amount = int(amount_str)
-            if amount <= 0:
-                print("Amount must be positive")
-                return
-        except ValueError:
-            print("Amount must be a number")
+        # Amounts are whole numbers; checking the digits first spares int() its
+        # sign, prefix and underscore handling and the exception on bad input
+        if not amount_str.isdecimal():
+            print("Amount must be a positive whole number")
+            return
+        amount = int(amount_str)
+        if amount == 0:
+            print("Amount must be positive")
             return
         
         # Get sender and recipient wallets
@@ -254,63 +405,66 @@ class InteractiveBlockchainConsole(cmd.Cmd):
             return
         
         # Verify transaction with appropriate method
-        if not self._verify_transaction_validity(sender_wallet, amount):
+        valid, current_balance = self._verify_transaction_validity(sender_wallet, amount)
+        if not valid:
             return
         
         # Execute transaction
-        print(f"\nSending {amount} from {sender_name} to {recipient_name}...")
-        result = sender_wallet.send_transaction(recipient_wallet, amount)
+        self.emit(f"\nSending {amount} from {sender_name} to {recipient_name}...")
+        result = sender_wallet.send_transaction(recipient_wallet, amount, known_balance=current_balance)
         
         if result:
-            print(f"Transaction successful!")
+            self.emit(f"Transaction successful!")
         else:
             print("Transaction failed")
     
     def do_show_block(self, arg):
-        """Show details of a mined block. Usage: show_block [block_index]"""
+        """Show details of a mined block.
+        Usage: show_block <block_index | head | tail>
+        Negative indices count back from the tip (-1 is the latest block)."""
         if not arg:
             print("No block index specified")
             return
         
-        try:
+        if arg in _BLOCK_ALIASES:
+            block_index = _BLOCK_ALIASES[arg]
+        elif arg.removeprefix('-').isdecimal():
             block_index = int(arg)
-
-            if block_index >= len(self.state_manager.blockchain.chain):
-                print("Block index out of range")
-                return
-
-            print(f"Block #{block_index}\n{self.state_manager.blockchain.chain[block_index].to_dict()}")
-        except ValueError:
+        else:
             print("Block index must be a number")
+            return
+        
+        try:
+            block = self.state_manager.blockchain.chain[block_index]
+        except IndexError:
+            print("Block index out of range")
+            return
+        print(f"Block #{block.index}\n{block.to_dict()}")
     
     def print_block_summary(self, block):
         """Print a summary of a mined block."""
-        print("\n=== New Block Mined ===")
-        if hasattr(block, 'index'):
-            print(f"Index: {block.index}")
-            print(f"Hash: {block.hash[:16]}...")
-            print(f"Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(block.timestamp))}")
-            print(f"Transactions: {len(block.transactions)}")
-            print(f"Previous Hash: {block.previous_hash[:16]}...")
+        if hasattr(block, 'summary'):
+            self.emit(f"\n=== New Block Mined ===\n{block.summary()}")
         else:
-            print(f"Block summary: {block}")
+            self.emit(f"\n=== New Block Mined ===\nBlock summary: {block}")
     
     def _get_wallet_by_name(self, name: str) -> Optional[Union[ZKBlockchainWallet, RingBlockchainWallet]]:
-        """Get wallet by name."""
-        name = name.lower()
-        if name == "alice":
-            return self.alice
-        elif name == "bob":
-            return self.bob
-        elif name == "charlie":
-            return self.charlie
-        elif name == "miner":
-            return self.miner_wallet
-        return None
+        """Get wallet by name; precmd has already lowercased it."""
+        return self._wallets.get(name)
+    
+    def _mempool_verify_pool(self, batch_size: int):
+        """Process pool for large mempool batches on multi-core machines, else the state manager's threads."""
+        if batch_size < PROOF_POOL_MIN_TXS or (os.cpu_count() or 1) < 2:
+            return self.state_manager.verify_pool
+        if self._proof_pool is None:
+            self._proof_pool = verify_process_pool(self.crypto_system.curve.name, verbose=self.verbose)
+        return self._proof_pool
     
     def do_quit(self, arg):
         """Exit the blockchain console."""
-        print("Exiting blockchain console...")
+        self.emit("Exiting blockchain console...")
+        if self._proof_pool is not None:
+            self._proof_pool.shutdown(cancel_futures=True)
         return True
     
     def do_exit(self, arg):
@@ -318,37 +472,33 @@ class InteractiveBlockchainConsole(cmd.Cmd):
         return self.do_quit(arg)
     
     def do_help(self, arg):
-        """List available commands."""
-        commands = [
-            ("mine", "Mine a new block with pending transactions"),
-            ("status", "Display the current blockchain status"),
-            ("wallet_status <name>", "Display status of a specific wallet"),
-            ("list_wallets", "List all available wallets"),
-            ("send <sender> <recipient> <amount>", "Send funds between wallets"),
-            ("show_block <block_index>", "Show details of a mined block"),
-            ("help", "List available commands"),
-            ("exit/quit", "Exit the blockchain console")
-        ]
-        
-        print("\nAvailable Commands:")
-        for cmd, desc in commands:
-            print(f" {cmd:<25} {desc}")
-        print()
+        """List available commands, or show the full usage of one.
+        Usage: help [command]"""
+        handler = self._dispatch.get(arg)
+        if handler is not None:
+            print(inspect.cleandoc(handler.__doc__ or ''))
+            return
+        print(f"\nAvailable Commands:\n{self._help_text}\n")
 
 
-def run_blockchain_console(encryption_scheme="zk-pedersen-elgamal"):
+def run_blockchain_console(encryption_scheme="zk-pedersen-elgamal", verbose=True):
     """Start the live blockchain console with proper integration."""
-    print(f"\n==== Starting Live Blockchain Console with {encryption_scheme} ====\n")
-    console = InteractiveBlockchainConsole(encryption_scheme)
+    if verbose:
+        print(f"\n==== Starting Live Blockchain Console with {encryption_scheme} ====\n")
+    console = InteractiveBlockchainConsole(encryption_scheme, verbose=verbose)
     console.cmdloop()
-    print("\n==== Exiting Live Blockchain Console ====")
+    if verbose:
+        print("\n==== Exiting Live Blockchain Console ====")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Live Blockchain Console with ZK or Ring Proofs')
     parser.add_argument('--scheme', type=str, 
-                        choices=['zk-pedersen-elgamal', 'ring-pedersen-elgamal'],
+                        choices=SCHEMES,
                         help='Select encryption scheme', default='zk-pedersen-elgamal')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Only print command results and errors, for scripted drivers')
     
     args = parser.parse_args()
-    run_blockchain_console(args.scheme)
\ No newline at end of file
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s", stream=sys.stdout)
+    run_blockchain_console(args.scheme, verbose=not args.quiet)
\ No newline at end of file
@@ -7,40 +7,14 @@ zero-knowledge proof systems, and blockchain state management.
 """
 
 import argparse
+import logging
 import os
 import sys
 
 # Make sure the current directory is in the path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-# Import the live console
-from live_console import run_blockchain_console
-
-try:
-    # Try importing from the original demos
-    from demos.paillier_demo import run_paillier_demo
-    from demos.pedersen_elgamal_demo import run_pedersen_elgamal_demo
-    from demos.ring_demo import run_ring_signature_demo
-    from demos.zk_demo import run_zk_demo
-    
-    # Import newer demos
-    try:
-        from demos.blockchain_demo import run_blockchain_demo
-        BLOCKCHAIN_DEMO_AVAILABLE = True
-    except ImportError:
-        BLOCKCHAIN_DEMO_AVAILABLE = False
-        
-    try:
-        from demos.merkle_demo import run_merkle_demo
-        MERKLE_DEMO_AVAILABLE = True
-    except ImportError:
-        MERKLE_DEMO_AVAILABLE = False
-        
-    from utils.primes import find_working_primes_by_size
-except ImportError:
-    print("Warning: Some demo modules could not be imported. Using fixed console only.")
-    BLOCKCHAIN_DEMO_AVAILABLE = False
-    MERKLE_DEMO_AVAILABLE = False
+# Demo modules pull in the crypto stack, so each one is imported only when it runs
 
 def main():
     parser = argparse.ArgumentParser(description='Homomorphic Cryptography Demos')
@@ -51,53 +25,77 @@ def main():
     parser.add_argument('--scheme', type=str,
                         choices=['zk-pedersen-elgamal', 'ring-pedersen-elgamal'],
                         help='Select encryption scheme for live demo', default='zk-pedersen-elgamal')
+    parser.add_argument('--fast', action='store_true',
+                        help='Skip the pauses between demo steps (same as DEMO_SLEEP=0)')
     
     args = parser.parse_args()
     
+    # Wallet and mining events are logged; show them like the rest of the demo output
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     if args.demo == 'live':
         print(f"\n=== Starting Interactive Blockchain Console with {args.scheme} protection ===")
+        from live_console import run_blockchain_console
         run_blockchain_console(args.scheme)
         return
 
+    # Demos pause for DEMO_SLEEP seconds between steps unless --fast is given
+    pacing = {'pause': 0} if args.fast else {}
+    
     # Run the requested demo(s)
     if args.demo == 'paillier' or args.demo == 'all':
         try:
+            from demos.paillier_demo import run_paillier_demo
             run_paillier_demo()
         except Exception as e:
             print(f"Error in Paillier demo: {e}")
     
     if args.demo == 'pedersen' or args.demo == 'all':
         try:
-            run_pedersen_elgamal_demo()
+            from demos.pedersen_elgamal_demo import run_pedersen_elgamal_demo
+            run_pedersen_elgamal_demo(**pacing)
         except Exception as e:
             print(f"Error in Pedersen demo: {e}")
     
     if args.demo == 'ring' or args.demo == 'all':
         try:
-            run_ring_signature_demo()
+            from demos.ring_demo import run_ring_signature_demo
+            run_ring_signature_demo(**pacing)
         except Exception as e:
             print(f"Error in Ring Signature demo: {e}")
     
     if args.demo == 'zk' or args.demo == 'all':
         try:
-            run_zk_demo()
+            from demos.zk_demo import run_zk_demo
+            run_zk_demo(**pacing)
         except Exception as e:
             print(f"Error in ZK demo: {e}")
     
-    if (args.demo == 'blockchain' or args.demo == 'all') and BLOCKCHAIN_DEMO_AVAILABLE:
+    if args.demo == 'blockchain' or args.demo == 'all':
         try:
-            run_blockchain_demo()
-        except Exception as e:
-            print(f"Error in Blockchain demo: {e}")
+            from demos.blockchain_demo import run_blockchain_demo
+        except ImportError:
+            run_blockchain_demo = None  # Optional; skipped when its dependencies are missing
+        if run_blockchain_demo:
+            try:
+                run_blockchain_demo(**pacing)
+            except Exception as e:
+                print(f"Error in Blockchain demo: {e}")
     
-    if (args.demo == 'merkle' or args.demo == 'all') and MERKLE_DEMO_AVAILABLE:
+    if args.demo == 'merkle' or args.demo == 'all':
         try:
-            run_merkle_demo()
-        except Exception as e:
-            print(f"Error in Merkle demo: {e}")
+            from demos.merkle_demo import run_merkle_demo
+        except ImportError:
+            run_merkle_demo = None  # Optional; skipped when its dependencies are missing
+        if run_merkle_demo:
+            try:
+                run_merkle_demo()
+            except Exception as e:
+                print(f"Error in Merkle demo: {e}")
     
     if args.demo == 'primes':
         try:
+            from utils.primes import find_working_primes_by_size
             find_working_primes_by_size()
         except Exception as e:
             print(f"Error finding primes: {e}")
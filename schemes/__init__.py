@@ -1,3 +1,3 @@
-from .paillier import generate_keypair, encrypt, decrypt, add_encrypted
+from .paillier import generate_keypair, encrypt, decrypt, add_encrypted, random_factors, batch_encrypt, batch_decrypt
 from .pedersen_elgamal import PedersenElGamal, Account
 from .ring_pedersen_elgamal import RingPedersenElGamal, StealthAccount
@@ -6,6 +6,16 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.math_helpers import lcm, L
 
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# With gmpy2, key material is stored as mpz and modexps go through GMP;
+# otherwise these are plain ints and the builtin pow
+_bignum = gmpy2.mpz if gmpy2 else int
+_powmod = gmpy2.powmod if gmpy2 else pow
+
 def generate_keypair(p, q):
     """Generate a keypair for the Paillier cryptosystem.
     
@@ -13,66 +23,153 @@ def generate_keypair(p, q):
         p, q: Large prime numbers
         
     Returns:
-        tuple: ((n, g), (lambda_, mu)) - public key and private key
+        tuple: ((n, g, n^2), (lambda_, mu, crt)) - public key and private key,
+        where crt holds (p, q, p^2, q^2, hp, hq, q^-1 mod p) for decrypt
     """
     n = p * q
     g = n + 1
     lambda_ = lcm(p - 1, q - 1)
     mu = pow(lambda_, -1, n)
-    return ((n, g), (lambda_, mu))
+    p_sq, q_sq = p * p, q * q
+    hp = pow(L(pow(g, p - 1, p_sq), p), -1, p)
+    hq = pow(L(pow(g, q - 1, q_sq), q), -1, q)
+    crt = tuple(map(_bignum, (p, q, p_sq, q_sq, hp, hq, pow(q, -1, p))))
+    return ((_bignum(n), _bignum(g), _bignum(n * n)), (_bignum(lambda_), _bignum(mu), crt))
+
+def _public_parts(pub_key):
+    """(n, g, n^2) from a public key, squaring n only for keys that lack n^2."""
+    if len(pub_key) > 2:
+        return pub_key
+    n, g = pub_key
+    return n, g, n * n
 
-def encrypt(pub_key, m):
+def _powmod_many(bases, exp, mod):
+    """[b^exp mod mod for b in bases], in one GIL-free gmpy2 call when available."""
+    if gmpy2 is not None and hasattr(gmpy2, 'powmod_base_list'):
+        return gmpy2.powmod_base_list(bases, exp, mod)
+    return [_powmod(b, exp, mod) for b in bases]
+
+def random_factors(pub_key, count):
+    """Precompute the plaintext-independent part of `count` encryptions.
+    
+    Args:
+        pub_key: Public key (n, g, n^2) or (n, g)
+        count: Number of factors to generate
+    
+    Returns:
+        list: r^n mod n^2 for fresh random r, one per future encryption
+    """
+    n, _, n_sq = _public_parts(pub_key)
+    return _powmod_many([random.randint(1, n - 1) for _ in range(count)], n, n_sq)
+
+def encrypt(pub_key, m, r_n=None):
     """Encrypt a message using Paillier encryption.
     
+    With g = n + 1 (as generate_keypair produces), g^m mod n^2 equals
+    1 + m*n by the binomial theorem, so only r^n needs a modexp.
+    
     Args:
-        pub_key: Public key (n, g)
+        pub_key: Public key (n, g, n^2) or (n, g)
         m: Message to encrypt
+        r_n: Optional factor from random_factors(); each must be used only once
     
     Returns:
         int: Encrypted ciphertext
     """
-    n, g = pub_key
-    r = random.randint(1, n - 1)
-    return (pow(g, m, n * n) * pow(r, n, n * n)) % (n * n)
+    n, g, n_sq = _public_parts(pub_key)
+    if r_n is None:
+        r_n = _powmod(random.randint(1, n - 1), n, n_sq)
+    g_m = (1 + m * n) % n_sq if g == n + 1 else _powmod(g, m, n_sq)
+    return (g_m * r_n) % n_sq
+
+def batch_encrypt(pub_key, messages):
+    """Encrypt several messages under the same public key.
+    
+    Args:
+        pub_key: Public key (n, g, n^2) or (n, g)
+        messages: Iterable of messages to encrypt
+    
+    Returns:
+        list: Ciphertexts, in the order of `messages`
+    """
+    messages = list(messages)
+    factors = random_factors(pub_key, len(messages))
+    return [encrypt(pub_key, m, r_n) for m, r_n in zip(messages, factors)]
 
 def decrypt(pub_key, priv_key, c):
     """Decrypt a Paillier ciphertext.
     
     Args:
-        pub_key: Public key (n, g)
-        priv_key: Private key (lambda_, mu)
+        pub_key: Public key (n, g, n^2) or (n, g)
+        priv_key: Private key (lambda_, mu) or (lambda_, mu, crt)
         c: Ciphertext to decrypt
     
+    When the private key carries the factorization (as generate_keypair
+    produces), the message is recovered mod p and mod q separately and
+    recombined with the CRT, so both modexps run over half-width moduli.
+    
     Returns:
         int: Decrypted message
     """
-    n, _ = pub_key
+    if len(priv_key) > 2:
+        p, q, p_sq, q_sq, hp, hq, q_inv_p = priv_key[2]
+        m_p = (L(_powmod(c % p_sq, p - 1, p_sq), p) * hp) % p
+        m_q = (L(_powmod(c % q_sq, q - 1, q_sq), q) * hq) % q
+        return int(m_q + q * (((m_p - m_q) * q_inv_p) % p))
+    
+    n, _, n_sq = _public_parts(pub_key)
     lambda_, mu = priv_key
-    return (L(pow(c, lambda_, n * n), n) * mu) % n
+    return int((L(_powmod(c, lambda_, n_sq), n) * mu) % n)
+
+def batch_decrypt(pub_key, priv_key, ciphertexts):
+    """Decrypt several ciphertexts under the same key.
+    
+    Args:
+        pub_key: Public key (n, g, n^2) or (n, g)
+        priv_key: Private key as generated by generate_keypair
+        ciphertexts: Iterable of ciphertexts
+    
+    Every ciphertext shares the exponent and modulus of each CRT half, so
+    the modexps go through one batched call per half.
+    
+    Returns:
+        list: Messages, in the order of `ciphertexts`
+    """
+    ciphertexts = list(ciphertexts)
+    if len(priv_key) <= 2:
+        return [decrypt(pub_key, priv_key, c) for c in ciphertexts]
+    
+    p, q, p_sq, q_sq, hp, hq, q_inv_p = priv_key[2]
+    xs_p = _powmod_many([c % p_sq for c in ciphertexts], p - 1, p_sq)
+    xs_q = _powmod_many([c % q_sq for c in ciphertexts], q - 1, q_sq)
+    messages = []
+    for x_p, x_q in zip(xs_p, xs_q):
+        m_p = (L(x_p, p) * hp) % p
+        m_q = (L(x_q, q) * hq) % q
+        messages.append(int(m_q + q * (((m_p - m_q) * q_inv_p) % p)))
+    return messages
 
 def add_encrypted(pub_key, c1, c2):
     """Add two encrypted values homomorphically.
     
     Args:
-        pub_key: Public key (n, g)
+        pub_key: Public key (n, g, n^2) or (n, g)
         c1, c2: Encrypted values
     
     Returns:
         int: Encrypted sum
     """
-    n, _ = pub_key
-    return (c1 * c2) % (n * n)
+    return (c1 * c2) % _public_parts(pub_key)[2]
 
 def multiply_constant(pub_key, c, k):
     """Multiply an encrypted value by a constant.
     
     Args:
-        pub_key: Public key (n, g)
+        pub_key: Public key (n, g, n^2) or (n, g)
         c: Encrypted value
         k: Constant factor
     
     Returns:
         int: Encrypted product
     """
-    n, _ = pub_key
-    return pow(c, k, n * n)
\ No newline at end of file
+    return _powmod(c, k, _public_parts(pub_key)[2])
\ No newline at end of file
@@ -3,6 +3,7 @@ import hashlib
 from tinyec import registry
 from tinyec.ec import Point
 from tqdm import tqdm
+from utils.math_helpers import fixed_base_table, fixed_base_mul, ladder_mul
 
 # Import constants
 from constants import (
@@ -11,54 +12,75 @@ from constants import (
     DEFAULT_CURVE, 
     DEFAULT_ACCOUNT_NAME_PREFIX,
     RANDOM_ACCOUNT_ID_MIN,
-    RANDOM_ACCOUNT_ID_MAX
+    RANDOM_ACCOUNT_ID_MAX,
+    FIXED_BASE_WINDOW
 )
 
 class PedersenElGamal:
-    def __init__(self, curve_name=DEFAULT_CURVE):
+    def __init__(self, curve_name=DEFAULT_CURVE, verbose=True):
+        # verbose=False hides the table-building progress bar
+        self.verbose = verbose
         # System setup
         self.curve = registry.get_curve(curve_name)
         self.G = self.curve.g
         self.q = self.curve.field.n
+        self._G_table = fixed_base_table(self.G, self.q.bit_length(), FIXED_BASE_WINDOW)
         
         # Create second generator H for Pedersen commitments
         h_seed = hashlib.sha256(PEDERSEN_H_GENERATOR_SEED).digest()
         h_value = int.from_bytes(h_seed, byteorder="big") % self.q
-        self.H = h_value * self.G
+        self.H = self._fixed_base_mul(h_value, self._G_table)
+        self._H_table = fixed_base_table(self.H, self.q.bit_length(), FIXED_BASE_WINDOW)
+        # (x, y) of i*G -> i, so decryption is one dict lookup. Each point
+        # is the previous one plus G rather than a fresh multiplication
         self.LOOKUP_G = {}
         
         # For simplicity: Tables for small values to help with "discrete log" problem
-        for i in tqdm(range(TABLE_MAX), desc="Building value table"):
-            point = i * self.G
-            self.LOOKUP_G[i] = point.x  # Simple lookup by x-coordinate
+        point = 0 * self.G
+        for i in tqdm(range(TABLE_MAX), desc="Building value table", disable=not verbose):
+            self.LOOKUP_G[(point.x, point.y)] = i
+            point = point + self.G
+        # Baby-step giant-step decryption steps back by TABLE_MAX * G at a time
+        self._giant_step = Point(self.curve, point.x, -point.y % self.curve.field.p)
+    
+    def _fixed_base_mul(self, k, table):
+        """k times the generator `table` was built for (self._G_table or self._H_table)."""
+        return fixed_base_mul(k % self.q, table, FIXED_BASE_WINDOW)
     
     def pedersen_commit(self, value, blinding_factor):
         """Create a Pedersen commitment to a value."""
-        return value * self.G + blinding_factor * self.H
+        return self._fixed_base_mul(value, self._G_table) + self._fixed_base_mul(blinding_factor, self._H_table)
     
     def twisted_elgamal_keygen(self):
         """Generate a keypair for Twisted ElGamal encryption."""
         sk = random.randint(1, self.q-1)
-        pk = sk * self.G
+        pk = self._fixed_base_mul(sk, self._G_table)
         return (sk, pk)
     
     def twisted_elgamal_encrypt(self, amount, recipient_pk, randomness=None):
         """Encrypt an amount using Twisted ElGamal encryption."""
         if randomness is None:
             randomness = random.randint(1, self.q-1)
-        return (randomness * self.G, amount * self.G + randomness * recipient_pk)
+        return (self._fixed_base_mul(randomness, self._G_table),
+                self._fixed_base_mul(amount, self._G_table) + ladder_mul(randomness, recipient_pk))
     
-    def twisted_elgamal_decrypt(self, ciphertext, sk):
-        """Decrypt a Twisted ElGamal ciphertext."""
+    def twisted_elgamal_decrypt(self, ciphertext, sk, max_value=TABLE_MAX):
+        """Decrypt a Twisted ElGamal ciphertext holding an amount below max_value.
+        
+        Amounts below TABLE_MAX are a single table lookup. Larger ones use
+        baby-step giant-step: the table serves as the baby steps, and each
+        giant step subtracts TABLE_MAX * G, so the cost grows with
+        max_value / TABLE_MAX. Returns None if the amount is not in range.
+        """
         c1, c2 = ciphertext
-        amount_point = c2 - sk * c1
+        amount_point = c2 - ladder_mul(sk, c1)
         
-        # In a real system, we might use more sophisticated methods to extract amount
-        # This is a simplified approach for small values
-        for i in range(TABLE_MAX):
-            if self.LOOKUP_G[i] == amount_point.x:
-                return i
-        return None  # Cannot determine exact amount
+        for giant in range(0, max_value, TABLE_MAX):
+            i = self.LOOKUP_G.get((amount_point.x, amount_point.y))
+            if i is not None:
+                return giant + i if giant + i < max_value else None
+            amount_point = amount_point + self._giant_step
+        return None
 
     def print_system_info(self):
         """Print information about the cryptographic system setup."""
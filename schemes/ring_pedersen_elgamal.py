@@ -4,6 +4,7 @@ import time
 from tinyec import registry
 from tinyec.ec import Point
 from .pedersen_elgamal import PedersenElGamal
+from utils.math_helpers import ladder_mul, multi_scalar_mul
 
 # Import constants
 from constants import (
@@ -15,35 +16,35 @@ from constants import (
 )
 
 class RingPedersenElGamal(PedersenElGamal):
-    def __init__(self, curve_name=DEFAULT_CURVE):
-        super().__init__(curve_name)
+    def __init__(self, curve_name=DEFAULT_CURVE, verbose=True):
+        super().__init__(curve_name, verbose)
     
     def generate_stealth_address(self, recipient_view_pk, recipient_spend_pk):
         """Generate one-time stealth address for sending funds privately."""
         r = random.randint(1, self.q-1)  # One-time random value
-        R = r * self.G  # Public value sent with transaction
+        R = self._fixed_base_mul(r, self._G_table)  # Public value sent with transaction
         
         # Shared secret - only recipient can compute this
-        shared_secret_point = r * recipient_view_pk
+        shared_secret_point = ladder_mul(r, recipient_view_pk)
         shared_secret = shared_secret_point.x.to_bytes((shared_secret_point.x.bit_length() + 7) // 8, byteorder='big')
         
         # Derive the one-time address
         h = int.from_bytes(hashlib.sha256(shared_secret).digest(), byteorder='big') % self.q
-        P = h * self.G + recipient_spend_pk
+        P = self._fixed_base_mul(h, self._G_table) + recipient_spend_pk
         
         return (R, P)  # Send these with transaction
     
     def recover_stealth_address(self, R, P, view_sk, spend_pk):
         """Recipient recovers funds sent to stealth address."""
         # Recompute shared secret
-        shared_secret_point = view_sk * R
+        shared_secret_point = ladder_mul(view_sk, R)
         shared_secret = shared_secret_point.x.to_bytes((shared_secret_point.x.bit_length() + 7) // 8, byteorder='big')
         
         # Derive h value
         h = int.from_bytes(hashlib.sha256(shared_secret).digest(), byteorder='big') % self.q
         
         # Check if P = h*G + spend_pk
-        expected_P = h * self.G + spend_pk
+        expected_P = self._fixed_base_mul(h, self._G_table) + spend_pk
         
         return (expected_P.x == P.x and expected_P.y == P.y)
     
@@ -66,14 +67,14 @@ class RingPedersenElGamal(PedersenElGamal):
         k = random.randint(1, self.q-1)
         
         # Start with the signer, compute their commitment
-        signer_point = k * self.G
+        signer_point = self._fixed_base_mul(k, self._G_table)
         
         # Generate random values for all other participants
         for i in range(n):
             if i != signer_idx:
                 s[i] = random.randint(1, self.q-1)
                 c[(i+1) % n] = int.from_bytes(hashlib.sha256((str(i) + str(message_hash) + 
-                                                             str((s[i] * self.G + c[i] * public_keys[i]).x)).encode()).digest(), byteorder='big') % self.q
+                                                             str(multi_scalar_mul((s[i], c[i]), (self.G, public_keys[i])).x)).encode()).digest(), byteorder='big') % self.q
         
         # Complete the ring for the signer
         c[(signer_idx+1) % n] = int.from_bytes(hashlib.sha256((str(signer_idx) + str(message_hash) + 
@@ -96,9 +97,9 @@ class RingPedersenElGamal(PedersenElGamal):
         c = [0] * n
         c[0] = c0
         
-        # Verify the ring
+        # Verify the ring; each link is s_i*G + c_i*P_i, and depends on the previous c
         for i in range(n):
-            point = s[i] * self.G + c[i] * public_keys[i]
+            point = multi_scalar_mul((s[i], c[i]), (self.G, public_keys[i]))
             c[(i+1) % n] = int.from_bytes(hashlib.sha256((str(i) + str(message_hash) + str(point.x)).encode()).digest(), byteorder='big') % self.q
         
         # If the ring closes correctly, the signature is valid
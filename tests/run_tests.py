@@ -14,7 +14,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import test modules
 from tests.test_merkle import TestMerkleTree
-from tests.test_blockchain import TestBlock, TestBlockchain
+from tests.test_blockchain import TestBlock, TestBlockchain, TestChainIndexes, TestNumbaPow
+from tests.test_state_manager import TestStateManager
+from tests.test_rwlock import TestRWLock
+from tests.test_paillier import TestPaillier
+from tests.test_zk_pedersen_elgamal import TestZKPedersenElGamal
+from tests.test_math_helpers import TestMathHelpers
+from tests.test_pedersen_elgamal import TestPedersenElGamal
 
 def run_test_suite():
     """Run all tests and report results."""
@@ -31,6 +37,14 @@ def run_test_suite():
     test_suite.addTest(unittest.makeSuite(TestMerkleTree))
     test_suite.addTest(unittest.makeSuite(TestBlock))
     test_suite.addTest(unittest.makeSuite(TestBlockchain))
+    test_suite.addTest(unittest.makeSuite(TestChainIndexes))
+    test_suite.addTest(unittest.makeSuite(TestNumbaPow))
+    test_suite.addTest(unittest.makeSuite(TestStateManager))
+    test_suite.addTest(unittest.makeSuite(TestRWLock))
+    test_suite.addTest(unittest.makeSuite(TestPaillier))
+    test_suite.addTest(unittest.makeSuite(TestZKPedersenElGamal))
+    test_suite.addTest(unittest.makeSuite(TestMathHelpers))
+    test_suite.addTest(unittest.makeSuite(TestPedersenElGamal))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -3,6 +3,8 @@ import sys
 import os
 import time
 import json
+import hashlib
+import tempfile
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -10,6 +12,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from blockchain.base import Block, Blockchain
 from utils.merkle import MerkleTree
 
+try:
+    from blockchain._pow_numba import search_nonce
+except ImportError:
+    search_nonce = None
+
 
 class TestBlock(unittest.TestCase):
     def setUp(self):
@@ -77,6 +84,37 @@ class TestBlock(unittest.TestCase):
         tampered_tx = dict(tx)
         tampered_tx['amount'] = 100
         self.assertFalse(self.block.verify_transaction(tampered_tx))
+    
+    def test_empty_block(self):
+        """Test that a block without transactions has the empty-tree Merkle root."""
+        empty_block = Block(0, time.time(), [], "0")
+        self.assertEqual(empty_block.merkle_root, MerkleTree([]).get_root_hash())
+        self.assertFalse(empty_block.verify_transaction(self.transactions[0]))
+    
+    def test_summary_follows_hash(self):
+        """Test that the summary reflects the block's current hash."""
+        self.assertIn(f"Hash: {self.block.hash[:16]}...", self.block.summary())
+        self.block.mine_block(1)
+        self.assertIn(f"Hash: {self.block.hash[:16]}...", self.block.summary())
+        self.assertIn(f"Transactions: {len(self.transactions)}", self.block.summary())
+    
+    def test_hash_matches_json_serialization(self):
+        """Test that the block hash equals the hash of the sorted JSON block data."""
+        for timestamp, nonce in ((self.block.timestamp, 0), (1700000000.125, 42), (1e-07, 123456789)):
+            self.block.timestamp = timestamp
+            self.block.nonce = nonce
+            block_data = {
+                'index': self.block.index,
+                'timestamp': self.block.timestamp,
+                'merkle_root': self.block.merkle_root,
+                'previous_hash': self.block.previous_hash,
+                'nonce': self.block.nonce
+            }
+            expected = hashlib.sha256(json.dumps(block_data, sort_keys=True).encode()).hexdigest()
+            self.assertEqual(self.block.calculate_hash(), expected)
+            
+            prefix, suffix = self.block._hash_parts()
+            self.assertEqual(hashlib.sha256(prefix + str(nonce).encode() + suffix).hexdigest(), expected)
 
 
 class TestBlockchain(unittest.TestCase):
@@ -172,5 +210,148 @@ class TestBlockchain(unittest.TestCase):
         self.assertEqual(recreated_blockchain.chain[1].merkle_root, self.blockchain.chain[1].merkle_root)
 
 
+class TestChainIndexes(unittest.TestCase):
+    def setUp(self):
+        """Set up a chain with address-based transactions."""
+        self.blockchain = Blockchain()
+        self.blockchain.add_transaction({'sender_address': 'alice', 'recipient_address': 'bob', 'amount': 10, 'tx_id': 'a1'})
+        self.blockchain.mine_pending_transactions()
+        self.blockchain.add_transaction({'sender_address': 'bob', 'recipient_address': 'carol', 'amount': 4, 'tx_id': 'b1'})
+        self.blockchain.add_transaction({'sender_address': 'carol', 'recipient_address': 'carol', 'amount': 1, 'tx_id': 'c1'})
+        self.blockchain.mine_pending_transactions()
+    
+    def test_balances_match_chain_walk(self):
+        """Test that cached balances agree with a full walk of the chain."""
+        for address in ('alice', 'bob', 'carol', 'nobody'):
+            expected = 0.0
+            for block in self.blockchain.chain:
+                for tx in block.transactions:
+                    if tx.get('sender_address') == address:
+                        expected += float(tx.get('amount', 0))
+                    if tx.get('recipient_address') == address:
+                        expected -= float(tx.get('amount', 0))
+            self.assertEqual(self.blockchain.get_balance(address), expected)
+    
+    def test_scan_for_transactions(self):
+        """Test that scanning returns each matching transaction once, in chain order."""
+        results = self.blockchain.scan_for_transactions('carol')
+        self.assertEqual([r['transaction']['tx_id'] for r in results], ['b1', 'c1'])
+        self.assertEqual(results[0]['block_index'], 2)
+        self.assertEqual(results[0]['block_hash'], self.blockchain.chain[2].hash)
+        self.assertEqual(self.blockchain.scan_for_transactions('nobody'), [])
+    
+    def test_index_rebuilt_from_dict(self):
+        """Test that a deserialized chain answers the same queries."""
+        recreated = Blockchain.from_dict(json.loads(json.dumps(self.blockchain.to_dict())))
+        for address in ('alice', 'bob', 'carol'):
+            self.assertEqual(recreated.get_balance(address), self.blockchain.get_balance(address))
+            self.assertEqual(recreated.scan_for_transactions(address),
+                             self.blockchain.scan_for_transactions(address))
+    
+    def test_verify_transaction_by_id(self):
+        """Test that tx_id lookups find the block and position of a transaction."""
+        self.assertEqual(self.blockchain.verify_transaction('c1'), (True, 2, 1))
+        self.assertEqual(self.blockchain.verify_transaction('missing'), (False, None, None))
+        
+        recreated = Blockchain.from_dict(json.loads(json.dumps(self.blockchain.to_dict())))
+        self.assertEqual(recreated.verify_transaction('a1'), (True, 1, 0))
+    
+    def test_in_place_edit_fails_verification(self):
+        """Test that editing a mined transaction breaks both Merkle checks."""
+        block = self.blockchain.chain[2]
+        self.assertTrue(block.verify_transaction(block.transactions[1]))
+        self.assertTrue(self.blockchain.verify_chain())
+        
+        block.transactions[1]['amount'] = 999
+        self.assertFalse(block.verify_transaction(block.transactions[1]))
+        self.assertEqual(self.blockchain.verify_transaction('c1'), (False, 2, 1))
+        self.assertFalse(self.blockchain.verify_chain())
+    
+    def test_non_numeric_amounts_count_as_zero(self):
+        """Test that blocks with missing or non-numeric amounts still mine and load."""
+        self.blockchain.add_transaction({'sender_address': 'dave', 'recipient_address': 'erin', 'amount': None, 'tx_id': 'd1'})
+        self.blockchain.add_transaction({'sender_address': 'dave', 'recipient_address': 'erin', 'amount': 'n/a', 'tx_id': 'd2'})
+        self.assertIsNotNone(self.blockchain.mine_pending_transactions())
+        self.assertEqual(self.blockchain.get_balance('erin'), 0)
+        
+        recreated = Blockchain.from_dict(json.loads(json.dumps(self.blockchain.to_dict())))
+        self.assertEqual(len(recreated.scan_for_transactions('dave')), 2)
+        self.assertTrue(recreated.verify_chain())
+    
+    def test_file_roundtrip_preserves_large_integers(self):
+        """Test that saving and loading keeps integers wider than 64 bits exact."""
+        big = 2 ** 200 + 1
+        self.blockchain.add_transaction({'sender_address': 'dave', 'recipient_address': 'erin',
+                                         'amount': 1, 'tx_id': 'd1', 'ciphertext_c1_x': big})
+        self.blockchain.mine_pending_transactions()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'chain.json')
+            self.blockchain.save_to_file(path)
+            loaded = Blockchain.load_from_file(path)
+        
+        self.assertEqual(loaded.chain[-1].transactions[0]['ciphertext_c1_x'], big)
+        self.assertEqual([b.hash for b in loaded.chain], [b.hash for b in self.blockchain.chain])
+        self.assertTrue(loaded.verify_chain())
+    
+    def test_incremental_verification_detects_tampering(self):
+        """Test that a re-verified chain still catches changes to checked blocks."""
+        self.assertTrue(self.blockchain.verify_chain())
+        self.blockchain.add_transaction({'sender_address': 'alice', 'recipient_address': 'dave', 'amount': 2, 'tx_id': 'a2'})
+        self.blockchain.mine_pending_transactions()
+        self.assertTrue(self.blockchain.verify_chain())
+        
+        self.blockchain.chain[1].transactions[0]['amount'] = 999
+        self.blockchain.chain[1].recalculate_merkle_root()
+        self.assertFalse(self.blockchain.verify_chain())
+    
+    def test_reverification_checks_headers_and_links(self):
+        """Test that header edits to an already-verified block are still caught."""
+        self.assertTrue(self.blockchain.verify_chain())
+        original = self.blockchain.chain[1].previous_hash
+        self.blockchain.chain[1].previous_hash = 'ff' * 32
+        self.assertFalse(self.blockchain.verify_chain())
+        
+        self.blockchain.chain[1].previous_hash = original
+        self.assertTrue(self.blockchain.verify_chain())
+        self.blockchain.chain[2].nonce += 1
+        self.blockchain.chain[2].timestamp += 1
+        self.assertFalse(self.blockchain.verify_chain())
+
+
+@unittest.skipUnless(search_nonce is not None, "numba is not installed")
+class TestNumbaPow(unittest.TestCase):
+    def setUp(self):
+        """Split a fixed block's hash input around the nonce."""
+        block = Block(1, 1700000000.0, [{'sender': 'Alice', 'recipient': 'Bob', 'amount': 10, 'tx_id': '1234'}],
+                      "prev_hash_123")
+        self.prefix, self.suffix = block._hash_parts()
+    
+    def reference_nonce(self, difficulty, start=0):
+        """First nonce from `start` whose hashlib digest meets the target."""
+        nonce = start
+        while not hashlib.sha256(self.prefix + str(nonce).encode() + self.suffix).hexdigest().startswith('0' * difficulty):
+            nonce += 1
+        return nonce
+    
+    def test_matches_hashlib_search(self):
+        """Test that the compiled search finds the same nonce as hashlib at several difficulties."""
+        for difficulty in (1, 2, 3, 4):
+            self.assertEqual(search_nonce(self.prefix, self.suffix, difficulty),
+                             self.reference_nonce(difficulty))
+    
+    def test_batches_and_start_offset(self):
+        """Test that small batches and a non-zero start still return the smallest match."""
+        start = self.reference_nonce(3) + 1
+        self.assertEqual(search_nonce(self.prefix, self.suffix, 3, start, batch_size=1000),
+                         self.reference_nonce(3, start))
+    
+    def test_mined_block_hash(self):
+        """Test that a block mined through the kernel gets a hash meeting the target."""
+        block = Block(1, 1700000000.0, [{'tx_id': 'numba'}], "prev_hash_123")
+        block.nonce = search_nonce(*block._hash_parts(), 4)
+        self.assertTrue(block.calculate_hash().startswith('0000'))
+
+
 if __name__ == '__main__':
     unittest.main()
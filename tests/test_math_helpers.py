@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import random
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinyec.ec import Inf
+from utils.math_helpers import get_curve, ladder_mul, multi_scalar_mul, _wnaf
+
+class TestMathHelpers(unittest.TestCase):
+    def test_ladder_mul_matches_tinyec(self):
+        """Test that the Montgomery ladder agrees with tinyec's scalar multiplication."""
+        rng = random.Random(1)
+        for curve_name in ('secp192r1', 'secp256r1'):
+            curve = get_curve(curve_name)
+            n = curve.field.n
+            P = rng.randrange(1, n) * curve.g
+            for k in [1, 2, 3, n - 1, n + 1, -1] + [rng.randrange(n) for _ in range(10)]:
+                expected = k * P
+                result = ladder_mul(k, P)
+                self.assertEqual((result.x, result.y), (expected.x, expected.y))
+    
+    def test_ladder_mul_infinity(self):
+        """Test that multiples of the group order give the point at infinity."""
+        curve = get_curve('secp192r1')
+        self.assertIsInstance(ladder_mul(0, curve.g), Inf)
+        self.assertIsInstance(ladder_mul(curve.field.n, curve.g), Inf)
+    
+    def test_multi_scalar_mul(self):
+        """Test that Straus' method matches the sum of separate multiplications."""
+        rng = random.Random(2)
+        curve = get_curve('secp192r1')
+        n = curve.field.n
+        points = [rng.randrange(1, n) * curve.g for _ in range(4)]
+        scalars = [rng.randrange(n) for _ in range(3)] + [0]
+        expected = scalars[0] * points[0] + scalars[1] * points[1] + scalars[2] * points[2]
+        result = multi_scalar_mul(scalars, points)
+        self.assertEqual((result.x, result.y), (expected.x, expected.y))
+        self.assertIsInstance(multi_scalar_mul([1, n - 1], [curve.g, curve.g]), Inf)
+    
+    def test_multi_scalar_mul_widths(self):
+        """Test that every wNAF width gives the same sum, including small and repeated terms."""
+        rng = random.Random(3)
+        curve = get_curve('secp192r1')
+        n = curve.field.n
+        P = rng.randrange(1, n) * curve.g
+        scalars = [1, 2, 15, 16, n - 1, rng.randrange(n)]
+        points = [P, curve.g, P, curve.g, curve.g, P]
+        expected = ladder_mul(1 + 15 + scalars[-1], P) + ladder_mul(2 + 16 + n - 1, curve.g)
+        for width in (2, 3, 4, 5, 6):
+            result = multi_scalar_mul(scalars, points, width)
+            self.assertEqual((result.x, result.y), (expected.x, expected.y))
+    
+    def test_wnaf_digits(self):
+        """Test that wNAF digits are odd, bounded, spaced and sum back to the scalar."""
+        rng = random.Random(4)
+        for width in (2, 4, 5):
+            for k in [1, 7, 255, 1 << 100] + [rng.randrange(1 << 192) for _ in range(20)]:
+                digits = _wnaf(k, width)
+                self.assertEqual(sum(d << i for i, d in enumerate(digits)), k)
+                nonzero = [i for i, d in enumerate(digits) if d]
+                self.assertTrue(all(digits[i] % 2 and abs(digits[i]) < 1 << (width - 1) for i in nonzero))
+                self.assertTrue(all(j - i >= width for i, j in zip(nonzero, nonzero[1:])))
+
+if __name__ == '__main__':
+    unittest.main()
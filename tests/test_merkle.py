@@ -5,7 +5,10 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.merkle import MerkleTree
+import hashlib
+import json
+
+from utils.merkle import MerkleTree, canonical_bytes, transaction_hash, blake3
 
 class TestMerkleTree(unittest.TestCase):
     def test_empty_tree(self):
@@ -82,7 +85,39 @@ class TestMerkleTree(unittest.TestCase):
         tree2 = MerkleTree(transactions2)
         
         self.assertNotEqual(tree1.get_root_hash(), tree2.get_root_hash())
-
+    
+    def test_root_of_matches_tree(self):
+        """Test that the stateless root helper agrees with the built tree."""
+        for count in range(0, 8):
+            transactions = [{'sender': f'User{i}', 'amount': i} for i in range(count)]
+            self.assertEqual(MerkleTree.root_of(transactions), MerkleTree(transactions).get_root_hash())
+    
+    def test_canonical_encoding(self):
+        """Test that encodings match json.dumps and follow in-place edits."""
+        tx = {'sender': 'Alice', 'recipient': 'Bob', 'amount': 10}
+        expected = json.dumps(tx, sort_keys=True).encode()
+        self.assertEqual(canonical_bytes(tx), expected)
+        self.assertEqual(transaction_hash(tx), hashlib.sha256(expected).hexdigest())
+        
+        # Editing the same dict changes its hash
+        tx['amount'] = 12
+        self.assertEqual(canonical_bytes(tx), json.dumps(tx, sort_keys=True).encode())
+        self.assertNotEqual(transaction_hash(tx), hashlib.sha256(expected).hexdigest())
+    
+    def test_unknown_hash_algo(self):
+        """Test that an unsupported hash_algo is rejected up front."""
+        with self.assertRaises(ValueError):
+            MerkleTree([{'amount': 1}], hash_algo='md5')
+    
+    @unittest.skipIf(blake3 is None, "blake3 is not installed")
+    def test_blake3_tree(self):
+        """Test that BLAKE3 trees are self-consistent and differ from SHA-256 ones."""
+        transactions = [{'sender': f'User{i}', 'amount': i} for i in range(5)]
+        tree = MerkleTree(transactions, hash_algo='blake3')
+        self.assertEqual(tree.get_root_hash(), MerkleTree.root_of(transactions, hash_algo='blake3'))
+        self.assertNotEqual(tree.get_root_hash(), MerkleTree(transactions).get_root_hash())
+        proof = tree.get_proof(transactions[3])
+        self.assertTrue(tree.verify_proof(tree.hash_transaction(transactions[3]), proof))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schemes.paillier import generate_keypair, encrypt, decrypt, add_encrypted, multiply_constant, random_factors, batch_encrypt, batch_decrypt
+from constants import PAILLIER_PRIME_P, PAILLIER_PRIME_Q
+
+class TestPaillier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Generate one keypair from the demo primes for all tests."""
+        cls.pub_key, cls.priv_key = generate_keypair(PAILLIER_PRIME_P, PAILLIER_PRIME_Q)
+    
+    def test_roundtrip(self):
+        """Test that decryption inverts encryption, including the edges of the plaintext range."""
+        n, _, _ = self.pub_key
+        for m in [0, 1, 42, 10 ** 9, n - 1]:
+            self.assertEqual(decrypt(self.pub_key, self.priv_key, encrypt(self.pub_key, m)), m)
+    
+    def test_crt_matches_textbook_decryption(self):
+        """Test that CRT decryption agrees with decrypting via lambda and mu alone."""
+        textbook_key = self.priv_key[:2]
+        for m in [0, 7, 2 ** 100]:
+            c = encrypt(self.pub_key, m)
+            self.assertEqual(decrypt(self.pub_key, self.priv_key, c), m)
+            self.assertEqual(decrypt(self.pub_key, textbook_key, c), m)
+    
+    def test_matches_textbook_encryption(self):
+        """Test that the g = n + 1 shortcut gives the same ciphertext as g^m * r^n."""
+        n, g, n_sq = self.pub_key
+        r_n = random_factors(self.pub_key, 1)[0]
+        self.assertEqual(encrypt(self.pub_key, 12345, r_n), (pow(g, 12345, n_sq) * r_n) % n_sq)
+    
+    def test_homomorphic_operations(self):
+        """Test ciphertext addition and multiplication by a constant."""
+        c1, c2 = (encrypt(self.pub_key, m, r_n) for m, r_n in zip((17, 25), random_factors(self.pub_key, 2)))
+        self.assertEqual(decrypt(self.pub_key, self.priv_key, add_encrypted(self.pub_key, c1, c2)), 42)
+        self.assertEqual(decrypt(self.pub_key, self.priv_key, multiply_constant(self.pub_key, c1, 3)), 51)
+    
+    def test_batch_encrypt(self):
+        """Test that batch encryption preserves order and uses fresh randomness."""
+        messages = [3, 1, 4, 1, 5]
+        ciphertexts = batch_encrypt(self.pub_key, messages)
+        self.assertEqual([decrypt(self.pub_key, self.priv_key, c) for c in ciphertexts], messages)
+        self.assertNotEqual(ciphertexts[1], ciphertexts[3])
+    
+    def test_batch_decrypt(self):
+        """Test that batch decryption matches single decryption, with and without CRT data."""
+        messages = [0, 8, 2 ** 64, 5]
+        ciphertexts = batch_encrypt(self.pub_key, messages)
+        self.assertEqual(batch_decrypt(self.pub_key, self.priv_key, ciphertexts), messages)
+        self.assertEqual(batch_decrypt(self.pub_key, self.priv_key[:2], ciphertexts), messages)
+    
+    def test_two_part_public_key(self):
+        """Test that (n, g) keys without the cached n^2 still work everywhere."""
+        short_key = self.pub_key[:2]
+        c1 = encrypt(short_key, 20)
+        c2 = encrypt(self.pub_key, 22)
+        self.assertEqual(decrypt(short_key, self.priv_key[:2], add_encrypted(short_key, c1, c2)), 42)
+        self.assertEqual(decrypt(self.pub_key, self.priv_key, multiply_constant(short_key, c1, 2)), 40)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schemes.pedersen_elgamal import PedersenElGamal
+from constants import TABLE_MAX
+
+class TestPedersenElGamal(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build one system (and its value table) and keypair for all tests."""
+        cls.system = PedersenElGamal()
+        cls.sk, cls.pk = cls.system.twisted_elgamal_keygen()
+    
+    def decrypt(self, amount, **kwargs):
+        ciphertext = self.system.twisted_elgamal_encrypt(amount, self.pk)
+        return self.system.twisted_elgamal_decrypt(ciphertext, self.sk, **kwargs)
+    
+    def test_table_range(self):
+        """Test that amounts inside the table decrypt with a single lookup."""
+        for amount in [0, 1, 77, TABLE_MAX - 1]:
+            self.assertEqual(self.decrypt(amount), amount)
+        self.assertIsNone(self.decrypt(TABLE_MAX))
+    
+    def test_giant_steps(self):
+        """Test that larger amounts decrypt when max_value allows them."""
+        max_value = 3 * TABLE_MAX + 5
+        for amount in [TABLE_MAX, 2 * TABLE_MAX + 123, max_value - 1]:
+            self.assertEqual(self.decrypt(amount, max_value=max_value), amount)
+        self.assertIsNone(self.decrypt(max_value, max_value=max_value))
+    
+    def test_negative_amounts_not_confused(self):
+        """Test that -v*G, which shares v*G's x-coordinate, does not decrypt to v."""
+        self.assertIsNone(self.decrypt(self.system.q - 5))
+
+if __name__ == '__main__':
+    unittest.main()
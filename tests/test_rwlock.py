@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rwlock import RWLock
+
+class TestRWLock(unittest.TestCase):
+    def test_readers_share_the_lock(self):
+        """Test that a second thread can read while the first holds a read lock."""
+        lock = RWLock()
+        acquired = threading.Event()
+        
+        def reader():
+            with lock.read_lock():
+                acquired.set()
+        
+        with lock.read_lock():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertTrue(acquired.wait(timeout=5))
+        thread.join()
+    
+    def test_writer_excludes_readers(self):
+        """Test that readers wait until the writer releases the lock."""
+        lock = RWLock()
+        acquired = threading.Event()
+        
+        def reader():
+            with lock.read_lock():
+                acquired.set()
+        
+        with lock.write_lock():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            self.assertFalse(acquired.wait(timeout=0.1))
+        self.assertTrue(acquired.wait(timeout=5))
+        thread.join()
+    
+    def test_writer_is_reentrant_and_may_read(self):
+        """Test nested write and read acquisition by the writing thread."""
+        lock = RWLock()
+        with lock:
+            with lock.write_lock():
+                with lock.read_lock():
+                    pass
+        # Fully released: another thread can write
+        def writer():
+            with lock.write_lock():
+                pass
+        
+        thread = threading.Thread(target=writer)
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+    
+    def test_upgrade_raises(self):
+        """Test that taking the write side while reading fails instead of deadlocking."""
+        lock = RWLock()
+        with lock.read_lock():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+
+
+if __name__ == '__main__':
+    unittest.main()
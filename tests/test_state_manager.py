@@ -0,0 +1,217 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain.state_manager import BlockchainStateManager
+from tinyec import registry
+
+
+class TestStateManager(unittest.TestCase):
+    def setUp(self):
+        """Set up a state manager with one mined and one pending transaction."""
+        self.state_manager = BlockchainStateManager()
+        self.state_manager.add_transaction({'sender_address': 'alice', 'recipient_address': 'bob', 'amount': 3, 'tx_id': 'a1'})
+        self.state_manager.mine_block('miner')
+        self.state_manager.add_transaction({'sender_address': 'bob', 'recipient_address': 'bob', 'amount': 1, 'tx_id': 'b1'})
+    
+    def test_transactions_for_address(self):
+        """Test that confirmed transactions come before mempool ones, each listed once."""
+        tx_ids = [tx['tx_id'] for tx in self.state_manager.get_transactions_for_address('bob')]
+        self.assertEqual(tx_ids, ['a1', 'b1'])
+        self.assertEqual(len(self.state_manager.get_transactions_for_address('miner')), 1)
+        self.assertEqual(self.state_manager.get_transactions_for_address('nobody'), [])
+    
+    def test_reset(self):
+        """Test that reset empties the chain, mempool and index but keeps the manager usable."""
+        self.state_manager.add_listener('block_mined', lambda block: None)
+        self.state_manager.reset()
+        self.assertEqual(len(self.state_manager.blockchain.chain), 1)
+        self.assertEqual(self.state_manager.mempool, [])
+        self.assertEqual(self.state_manager.get_transactions_for_address('bob'), [])
+        self.assertEqual(self.state_manager.listeners.get('block_mined', []), [])
+        self.state_manager.add_transaction({'sender_address': 'carol', 'recipient_address': 'bob', 'amount': 2, 'tx_id': 'r1'})
+        self.state_manager.mine_block('miner')
+        self.assertEqual([tx['tx_id'] for tx in self.state_manager.get_transactions_for_address('bob')], ['r1'])
+    
+    def test_index_follows_mining(self):
+        """Test that mined mempool transactions are not reported twice."""
+        self.state_manager.mine_block('miner')
+        tx_ids = [tx['tx_id'] for tx in self.state_manager.get_transactions_for_address('bob')]
+        self.assertEqual(tx_ids, ['a1', 'b1'])
+        self.assertEqual(len(self.state_manager.get_transactions_for_address('miner')), 2)
+    
+    def test_blocks_mined_directly_on_blockchain(self):
+        """Test that blocks added without the state manager are still indexed."""
+        blockchain = self.state_manager.blockchain
+        blockchain.add_transaction({'sender_address': 'alice', 'recipient_address': 'carol', 'amount': 2, 'tx_id': 'a2'})
+        blockchain.mine_pending_transactions()
+        tx_ids = [tx['tx_id'] for tx in self.state_manager.get_transactions_for_address('alice')]
+        self.assertEqual(tx_ids, ['a1', 'a2'])
+    
+    def test_save_and_load_state(self):
+        """Test that a reloaded state answers address queries whatever the sidecar holds."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'chain.json')
+            self.state_manager.save_state(path)
+            self.assertTrue(os.path.exists(path + '.cache'))
+            
+            # New blocks mined after the snapshot are indexed on load
+            self.state_manager.mine_block('miner')
+            self.state_manager.blockchain.save_to_file(path)
+            
+            loaded = BlockchainStateManager()
+            loaded.load_state(path)
+            self.assertEqual([tx['tx_id'] for tx in loaded.get_transactions_for_address('bob')], ['a1', 'b1'])
+            
+            os.remove(path + '.cache')
+            rebuilt = BlockchainStateManager()
+            rebuilt.load_state(path)
+            self.assertEqual(rebuilt.get_transactions_for_address('bob'), loaded.get_transactions_for_address('bob'))
+            
+            # A sidecar without the expected keys is ignored
+            with open(path + '.cache', 'w') as file:
+                file.write('{"public_keys": [["secp256r1"]]}')
+            partial = BlockchainStateManager()
+            partial.load_state(path)
+            self.assertEqual(partial.get_transactions_for_address('bob'), loaded.get_transactions_for_address('bob'))
+    
+    def test_background_scanning_wakes_on_change(self):
+        """Test that the scanner reports changes promptly and stops without delay."""
+        changed = threading.Event()
+        self.state_manager.scanning_frequency = 60
+        self.state_manager.add_listener('state_changed', lambda summary: changed.set())
+        self.state_manager.start_background_scanning()
+        try:
+            self.state_manager.add_transaction({'sender_address': 'carol', 'recipient_address': 'dave', 'amount': 1, 'tx_id': 'c1'})
+            self.assertTrue(changed.wait(timeout=5))
+        finally:
+            self.state_manager.stop_background_scanning()
+        self.assertIsNone(self.state_manager._scanning_thread)
+    
+    def test_verifier_drops_invalid_transactions(self):
+        """Test that a verifier running on the shared pool filters the mempool before mining."""
+        state_manager = self.state_manager
+        state_manager.add_transaction({'sender_address': 'eve', 'recipient_address': 'bob', 'amount': 9, 'tx_id': 'e1'})
+        state_manager.set_transaction_verifier(
+            lambda txs: list(state_manager.verify_pool.map(lambda tx: tx['sender_address'] != 'eve', txs))
+        )
+        self.assertIs(state_manager.verify_pool, state_manager.verify_pool)
+        block = state_manager.mine_block('miner')
+        self.assertEqual([tx['tx_id'] for tx in block.transactions[:-1]], ['b1'])
+        self.assertEqual(state_manager.get_transactions_for_address('eve'), [])
+    
+    def test_verification_cache(self):
+        """Test that a transaction is verified once and an altered copy is verified again."""
+        calls = []
+        def verify(tx):
+            calls.append(tx['tx_id'])
+            return tx['amount'] < 5
+        tx = {'sender_address': 'alice', 'recipient_address': 'bob', 'amount': 3, 'tx_id': 'c1'}
+        self.assertTrue(self.state_manager.cached_verification(tx, verify))
+        self.assertTrue(self.state_manager.cached_verification(dict(tx), verify))
+        self.assertFalse(self.state_manager.cached_verification(dict(tx, amount=7), verify))
+        self.assertEqual(calls, ['c1', 'c1'])
+    
+    def test_verification_cache_many(self):
+        """Test that a batch verifier only sees transactions without a cached result."""
+        batches = []
+        def verify_many(txs):
+            batches.append([tx['tx_id'] for tx in txs])
+            return [tx['amount'] < 5 for tx in txs]
+        seen = {'sender_address': 'alice', 'recipient_address': 'bob', 'amount': 3, 'tx_id': 'm1'}
+        self.state_manager.cached_verification(seen, lambda tx: True)
+        txs = [seen, dict(seen, amount=7, tx_id='m2'), dict(seen, tx_id='m3')]
+        self.assertEqual(self.state_manager.cached_verification_many(txs, verify_many), [True, False, True])
+        self.assertEqual(self.state_manager.cached_verification_many(txs, verify_many), [True, False, True])
+        self.assertEqual(batches, [['m2', 'm3']])
+    
+    def test_transaction_objects_stored_as_dicts(self):
+        """Test that objects with to_dict() are converted once when added."""
+        class Tx:
+            def to_dict(self):
+                return {'sender_address': 'dave', 'recipient_address': 'bob', 'amount': 2, 'tx_id': 'd1'}
+        self.state_manager.add_transaction(Tx())
+        self.assertEqual(self.state_manager.mempool[-1]['tx_id'], 'd1')
+        self.state_manager.mine_block('miner')
+        self.assertEqual([tx['tx_id'] for tx in self.state_manager.get_transactions_for_address('dave')], ['d1'])
+        self.assertTrue(all(isinstance(tx, dict) for tx in self.state_manager.get_all_transactions()))
+    
+    def test_public_key_registry(self):
+        """Test that keys are registered once and excluded keys are never sampled."""
+        curve = registry.get_curve('secp192r1')
+        keys = [i * curve.g for i in range(1, 5)]
+        for pk in keys + [keys[0]]:
+            self.state_manager.register_public_key(pk)
+        self.assertEqual(len(self.state_manager.public_keys_registry), 4)
+        
+        selected = self.state_manager.get_random_public_keys(3, exclude=[keys[0]])
+        self.assertEqual(len(selected), 3)
+        self.assertNotIn(keys[0], selected)
+    
+    def test_listeners_run_before_mine_block_returns(self):
+        """Test that block_mined callbacks run on the mining thread by default."""
+        seen = []
+        self.state_manager.add_listener('block_mined', lambda block: seen.append(
+            (block.index, threading.current_thread().name)))
+        self.state_manager.mine_block('miner')
+        self.assertEqual(seen, [(2, threading.current_thread().name)])
+    
+    def test_async_listeners_run_off_the_mining_thread(self):
+        """Test that async callbacks run on the notify pool and can be waited for."""
+        state_manager = BlockchainStateManager(async_listeners=True)
+        seen = []
+        def on_block(block):
+            time.sleep(0.05)
+            seen.append((block.index, threading.current_thread().name))
+        state_manager.add_listener('block_mined', on_block)
+        state_manager.add_transaction({'sender_address': 'alice', 'recipient_address': 'bob',
+                                       'amount': 1, 'tx_id': 'async'})
+        state_manager.mine_block('miner')
+        state_manager.wait_for_listeners()
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(seen[0][0], 1)
+        self.assertTrue(seen[0][1].startswith('bc-notify'))
+        state_manager.stop_background_scanning()
+    
+    def test_random_public_keys_from_pool(self):
+        """Test that generated decoy keys are valid, distinct and registered."""
+        curve = registry.get_curve('secp192r1')
+        selected = self.state_manager.get_random_public_keys(5)
+        self.assertEqual(len(selected), 5)
+        self.assertTrue(all(curve.on_curve(pk.x, pk.y) for pk in selected))
+        self.assertEqual(len({(pk.x, pk.y) for pk in selected}), 5)
+        self.assertEqual(len(self.state_manager.public_keys_registry), 5)
+    
+    def test_concurrent_adds_across_shards(self):
+        """Test that concurrent adds all land in the mempool and are mined in arrival order."""
+        def add(worker):
+            for i in range(50):
+                self.state_manager.add_transaction({'sender_address': f'w{worker}', 'recipient_address': f'r{i}',
+                                                   'amount': 1, 'tx_id': f'{worker}-{i}'})
+        threads = [threading.Thread(target=add, args=(w,)) for w in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        mempool = self.state_manager.mempool
+        self.assertEqual(len(mempool), 201)
+        self.assertEqual(self.state_manager.get_state_summary()['mempool_size'], 201)
+        for w in range(4):
+            ids = [tx['tx_id'] for tx in mempool if tx['sender_address'] == f'w{w}']
+            self.assertEqual(ids, [f'{w}-{i}' for i in range(50)])
+            self.assertEqual(len(self.state_manager.get_transactions_for_address(f'w{w}')), 50)
+        
+        block = self.state_manager.mine_block('miner')
+        self.assertEqual(block.transactions[:-1], mempool)
+        self.assertEqual(self.state_manager.mempool, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
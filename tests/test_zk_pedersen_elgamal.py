@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import tempfile
+import contextlib
+import io
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zkp.zk_pedersen_elgamal import ZKPedersenElGamal
+
+class TestZKPedersenElGamal(unittest.TestCase):
+    def test_value_table_cache(self):
+        """Test that a cached value table is reused and matches a fresh build."""
+        with tempfile.TemporaryDirectory() as cache_dir, contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(io.StringIO()):
+            built = dict(ZKPedersenElGamal().generate_value_table(max_range=50, cache_dir=cache_dir))
+            self.assertEqual(os.listdir(cache_dir), ["secp192r1_50_v2.bin"])
+            
+            zk = ZKPedersenElGamal()
+            zk.G = None  # Any attempt to rebuild would fail
+            self.assertEqual(zk.generate_value_table(max_range=50, cache_dir=cache_dir), built)
+        
+        self.assertEqual(len(built), 50)
+        self.assertEqual(built[(7 * ZKPedersenElGamal().G).x], 7)
+    
+    def test_value_table_unreadable_cache(self):
+        """Test that a corrupt cache file is rebuilt rather than trusted."""
+        with tempfile.TemporaryDirectory() as cache_dir, contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(io.StringIO()):
+            with open(os.path.join(cache_dir, "secp192r1_10_v2.bin"), 'wb') as file:
+                file.write(b"truncated")
+            table = ZKPedersenElGamal().generate_value_table(max_range=10, cache_dir=cache_dir)
+        self.assertEqual(sorted(table.values()), list(range(10)))
+    
+    def test_value_table_wrong_cache_contents(self):
+        """Test that a readable cache holding the wrong table is rebuilt."""
+        with tempfile.TemporaryDirectory() as cache_dir, contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(io.StringIO()):
+            with open(os.path.join(cache_dir, "secp192r1_10_v2.bin"), 'wb') as file:
+                file.write(b''.join(i.to_bytes(24, 'big') for i in range(1, 10)))
+            table = ZKPedersenElGamal().generate_value_table(max_range=10, cache_dir=cache_dir)
+        zk = ZKPedersenElGamal()
+        self.assertEqual(table[(3 * zk.G).x], 3)
+    
+    def test_fixed_base_multiplication(self):
+        """Test that the precomputed G and H tables agree with plain scalar multiplication."""
+        zk = ZKPedersenElGamal()
+        for k in [0, 1, 15, 16, 12345, zk.q - 1, zk.q, zk.q + 7, -3, 2 ** 150 + 99]:
+            for base in (zk.G, zk.H):
+                expected = k * base
+                result = zk._ecmul(k, base)
+                self.assertEqual((result.x, result.y), (expected.x, expected.y))
+    
+    def test_batch_range_proof_verification(self):
+        """Test that batched range-proof verification accepts valid proofs and catches a forged one."""
+        zk = ZKPedersenElGamal()
+        proofs = [zk.range_proof(v, 0, 1000) for v in (0, 37, 1000)]
+        self.assertTrue(zk.batch_verify_range_proofs(proofs))
+        self.assertTrue(all(zk.verify_range_proof(proof) for proof in proofs))
+        
+        forged = dict(proofs[1], bit_proofs=[dict(p) for p in proofs[1]['bit_proofs']])
+        forged['bit_proofs'][2]['s1'] += 1
+        self.assertFalse(zk.verify_range_proof(forged))
+        self.assertFalse(zk.batch_verify_range_proofs([proofs[0], forged, proofs[2]]))
+        
+        shifted = dict(proofs[1], sum_proof=dict(proofs[1]['sum_proof'], s=proofs[1]['sum_proof']['s'] + 1))
+        self.assertFalse(zk.verify_range_proof(shifted))
+
+if __name__ == '__main__':
+    unittest.main()
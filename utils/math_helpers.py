@@ -1,4 +1,7 @@
 from math import gcd
+from functools import lru_cache
+from tinyec import registry
+from tinyec.ec import Point, Inf
 
 def lcm(a, b):
     """Compute the Least Common Multiple of a and b."""
@@ -12,4 +15,226 @@ def safe_equals(x, y):
     try:
         return int(str(x).strip()) == int(str(y).strip())
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+@lru_cache(maxsize=8)
+def get_curve(curve_name):
+    """Return the named tinyec curve, building it only once per process."""
+    return registry.get_curve(curve_name)
+
+def fixed_base_table(P, bits, window=4):
+    """Precompute multiples of a fixed point for fixed_base_mul.
+    
+    Row i holds j * 2^(window*i) * P for j in [0, 2^window), with row[0]
+    left as None, for enough rows to cover `bits`-bit scalars.
+    """
+    rows = []
+    base = P
+    for _ in range(-(-bits // window)):
+        row = [None, base]
+        for _ in range(2, 1 << window):
+            row.append(row[-1] + base)
+        rows.append(row)
+        base = row[-1] + base
+    return rows
+
+@lru_cache(maxsize=8)
+def generator_table(curve_name, window=4):
+    """fixed_base_table for a named curve's generator, built once per process."""
+    curve = get_curve(curve_name)
+    return fixed_base_table(curve.g, curve.field.n.bit_length(), window)
+
+def fixed_base_mul(k, table, window=4):
+    """k * P using a table from fixed_base_table(P, ...) built with the same window.
+    
+    k must be non-negative and fit in the table; callers reduce it mod the group order.
+    The sum is kept in Jacobian coordinates, so only the result needs an inverse.
+    """
+    curve = table[0][1].curve
+    p, a = curve.field.p, curve.a
+    mask = (1 << window) - 1
+    R = (0, 1, 0)
+    for row in table:
+        if not k:
+            break
+        digit = k & mask
+        k >>= window
+        if digit:
+            point = row[digit]
+            R = _jacobian_add_affine(*R, point.x, point.y, a, p)
+    if k:
+        raise ValueError("scalar is too large for this table")
+    return _jacobian_to_point(curve, *R)
+
+def _jacobian_double(X, Y, Z, a, p):
+    """2*(X:Y:Z) in Jacobian coordinates."""
+    if not Y or not Z:
+        return 0, 1, 0
+    YY = Y * Y % p
+    S = 4 * X * YY % p
+    ZZ = Z * Z % p
+    if a == p - 3:
+        # a = -3 (the NIST curves): 3X^2 - 3Z^4 factors, saving a squaring
+        M = 3 * (X - ZZ) * (X + ZZ) % p
+    else:
+        M = (3 * X * X + a * ZZ * ZZ) % p
+    X3 = (M * M - 2 * S) % p
+    return X3, (M * (S - X3) - 8 * YY * YY) % p, 2 * Y * Z % p
+
+def _jacobian_add(X1, Y1, Z1, X2, Y2, Z2, a, p):
+    """(X1:Y1:Z1) + (X2:Y2:Z2) in Jacobian coordinates; Z = 0 is the point at infinity."""
+    if not Z1:
+        return X2, Y2, Z2
+    if not Z2:
+        return X1, Y1, Z1
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    U2 = X2 * Z1Z1 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - U1) % p
+    r = (S2 - S1) % p
+    if not H:
+        return _jacobian_double(X1, Y1, Z1, a, p) if not r else (0, 1, 0)
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    return X3, (r * (V - X3) - S1 * HHH) % p, Z1 * Z2 * H % p
+
+def _jacobian_add_affine(X1, Y1, Z1, x2, y2, a, p):
+    """(X1:Y1:Z1) + (x2, y2) for an affine second point, which saves four
+    multiplications over _jacobian_add."""
+    if not Z1:
+        return x2, y2, 1
+    Z1Z1 = Z1 * Z1 % p
+    U2 = x2 * Z1Z1 % p
+    S2 = y2 * Z1 * Z1Z1 % p
+    H = (U2 - X1) % p
+    r = (S2 - Y1) % p
+    if not H:
+        return _jacobian_double(X1, Y1, Z1, a, p) if not r else (0, 1, 0)
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    return X3, (r * (V - X3) - Y1 * HHH) % p, Z1 * H % p
+
+def _jacobian_to_point(curve, X, Y, Z):
+    """tinyec point for (X:Y:Z), with the single inverse a Jacobian computation needs."""
+    if not Z:
+        return Inf(curve)
+    p = curve.field.p
+    z_inv = pow(Z, -1, p)
+    zz_inv = z_inv * z_inv % p
+    return Point(curve, X * zz_inv % p, Y * zz_inv * z_inv % p)
+
+def _to_affine_many(points, p):
+    """Affine (x, y) for Jacobian points with nonzero Z, using one modular
+    inverse for the whole list (Montgomery's trick)."""
+    prefix = []
+    acc = 1
+    for _, _, Z in points:
+        prefix.append(acc)
+        acc = acc * Z % p
+    inv = pow(acc, -1, p)
+    affine = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        X, Y, Z = points[i]
+        z_inv = inv * prefix[i] % p
+        inv = inv * Z % p
+        zz_inv = z_inv * z_inv % p
+        affine[i] = (X * zz_inv % p, Y * zz_inv * z_inv % p)
+    return affine
+
+def ladder_mul(k, P):
+    """k * P with the Montgomery ladder over Jacobian coordinates.
+    
+    Every bit costs one addition and one doubling, and only the final
+    conversion back to affine coordinates needs a modular inverse, where
+    tinyec's double-and-add inverts at every step.
+    """
+    if isinstance(P, Inf):
+        return P
+    curve = P.curve
+    p, a = curve.field.p, curve.a
+    k %= curve.field.n
+    R0 = (0, 1, 0)
+    R1 = (P.x, P.y, 1)
+    for i in range(k.bit_length() - 1, -1, -1):
+        if (k >> i) & 1:
+            R0 = _jacobian_add(*R0, *R1, a, p)
+            R1 = _jacobian_double(*R1, a, p)
+        else:
+            R1 = _jacobian_add(*R0, *R1, a, p)
+            R0 = _jacobian_double(*R0, a, p)
+    return _jacobian_to_point(curve, *R0)
+
+def _wnaf(k, width):
+    """Width-`width` non-adjacent form of k, least significant digit first.
+    
+    Digits are zero or odd with |d| < 2^(width-1), and any two nonzero
+    digits are at least `width` positions apart.
+    """
+    digits = []
+    full = 1 << width
+    half = full >> 1
+    while k:
+        if k & 1:
+            d = k & (full - 1)
+            if d >= half:
+                d -= full
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+def multi_scalar_mul(scalars, points, width=5):
+    """sum(k_i * P_i) by Straus' method over wNAF scalars, sharing one doubling chain.
+    
+    Each point gets a table of its odd multiples P, 3P, ..., (2^(width-1) - 1)P,
+    converted to affine coordinates together with one inverse so every
+    addition in the main loop is a mixed one. The wNAF digits need about one
+    addition per width + 1 bits, and negative digits just negate y. Not
+    constant time, so meant for verification rather than secret scalars.
+    """
+    curve = points[0].curve
+    p, a, n = curve.field.p, curve.a, curve.field.n
+    pairs = [(k % n, P) for k, P in zip(scalars, points) if k % n and not isinstance(P, Inf)]
+    if not pairs:
+        return Inf(curve)
+    
+    # 3P .. (2^(width-1) - 1)P for every point; the group order is prime, so none is infinity
+    per_point = (1 << (width - 2)) - 1
+    multiples = []
+    for _, P in pairs:
+        P2 = _jacobian_double(P.x, P.y, 1, a, p)
+        Q = (P.x, P.y, 1)
+        for _ in range(per_point):
+            Q = _jacobian_add(*Q, *P2, a, p)
+            multiples.append(Q)
+    affine = _to_affine_many(multiples, p) if multiples else []
+    
+    # Additions grouped by bit position, with the negation already applied
+    adds = []
+    for i, (k, P) in enumerate(pairs):
+        odd = [(P.x, P.y)] + affine[i * per_point:(i + 1) * per_point]
+        digits = _wnaf(k, width)
+        if len(digits) > len(adds):
+            adds.extend([] for _ in range(len(digits) - len(adds)))
+        for bit, d in enumerate(digits):
+            if d > 0:
+                adds[bit].append(odd[d >> 1])
+            elif d < 0:
+                x, y = odd[-d >> 1]
+                adds[bit].append((x, p - y))
+    
+    R = (0, 1, 0)
+    for bit in range(len(adds) - 1, -1, -1):
+        R = _jacobian_double(*R, a, p)
+        for x, y in adds[bit]:
+            R = _jacobian_add_affine(*R, x, y, a, p)
+    return _jacobian_to_point(curve, *R)
@@ -1,8 +1,56 @@
 import hashlib
-import json
 from typing import List, Dict, Any, Optional, Union
 from zkp.zk_pedersen_elgamal import ZKProofEncoder
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# hash_algo name -> hashlib-style constructor; blake3 is only offered when installed
+_HASHERS = {'sha256': hashlib.sha256}
+if blake3 is not None:
+    _HASHERS['blake3'] = blake3.blake3
+
+# Equivalent to json.dumps(tx, sort_keys=True, cls=ZKProofEncoder), without
+# building a new encoder for every transaction
+_TX_ENCODER = ZKProofEncoder(sort_keys=True)
+
+def canonical_bytes(transaction: Dict[str, Any]) -> bytes:
+    """Canonical (sorted-key JSON) encoding of a transaction.
+    
+    Always re-encoded: transactions are plain dicts that can be edited in
+    place, and verification has to see their current contents.
+    """
+    return _TX_ENCODER.encode(transaction).encode()
+
+def transaction_hash(transaction: Dict[str, Any]) -> str:
+    """SHA-256 hex digest of a transaction's canonical encoding."""
+    return hashlib.sha256(canonical_bytes(transaction)).hexdigest()
+
+def _hasher(hash_algo: str):
+    """Hash constructor for a hash_algo name."""
+    try:
+        return _HASHERS[hash_algo]
+    except KeyError:
+        if hash_algo == 'blake3':
+            raise ValueError("hash_algo='blake3' requires the blake3 package") from None
+        raise ValueError(f"Unknown hash_algo: {hash_algo!r}") from None
+
+def _hash_level(hashes: List[str], hash_fn=hashlib.sha256) -> List[str]:
+    """
+    Hash one tree level into the next, pairing an odd last node with itself.
+    
+    A parent is the hash of its children's concatenated hex digests. The whole
+    level is encoded into one buffer and each pair is hashed from a memoryview
+    slice, so there is no per-pair string concatenation or encode.
+    """
+    if len(hashes) % 2 == 1:
+        hashes = hashes + [hashes[-1]]
+    pair = 2 * len(hashes[0])
+    buf = memoryview(''.join(hashes).encode())
+    return [hash_fn(buf[i:i + pair]).hexdigest() for i in range(0, len(buf), pair)]
+
 class MerkleNode:
     """Node in a Merkle tree."""
     def __init__(self, hash_value: str, left=None, right=None, data=None):
@@ -22,26 +70,32 @@ class MerkleTree:
     
     A Merkle tree is a binary tree where each leaf node is a hash of a transaction,
     and each non-leaf node is a hash of its two child nodes.
+    
+    hash_algo selects the hash function: 'sha256' (the default, and what
+    blocks use) or 'blake3' when the blake3 package is installed.
     """
-    def __init__(self, transactions: List[Dict[str, Any]] = None):
+    def __init__(self, transactions: List[Dict[str, Any]] = None, hash_algo: str = 'sha256'):
         self.root = None
+        self.hash_algo = hash_algo
+        self._hash = _hasher(hash_algo)
         if transactions:
             self.build_tree(transactions)
     
     def hash_transaction(self, transaction: Dict[str, Any]) -> str:
         """Hash a transaction dictionary."""
-        tx_string = json.dumps(transaction, sort_keys=True, cls=ZKProofEncoder).encode()
-        return hashlib.sha256(tx_string).hexdigest()
+        if self.hash_algo == 'sha256':
+            return transaction_hash(transaction)
+        return self._hash(canonical_bytes(transaction)).hexdigest()
     
     def hash_pair(self, left_hash: str, right_hash: str) -> str:
         """Hash two child hashes together."""
         combined = (left_hash + right_hash).encode()
-        return hashlib.sha256(combined).hexdigest()
+        return self._hash(combined).hexdigest()
     
     def build_tree(self, transactions: List[Dict[str, Any]]) -> None:
         """Build a Merkle tree from a list of transactions."""
         if not transactions:
-            self.root = MerkleNode(hashlib.sha256(b"").hexdigest())
+            self.root = MerkleNode(self._hash(b"").hexdigest())
             return
         
         # Create leaf nodes for transactions
@@ -56,38 +110,55 @@ class MerkleTree:
             leaves.append(leaves[-1])
         
         # Build tree from bottom up
-        self.root = self._build_tree_recursive(leaves)
+        self.root = self._build_levels(leaves)
     
-    def _build_tree_recursive(self, nodes: List[MerkleNode]) -> Optional[MerkleNode]:
-        """Recursively build the Merkle tree from leaf nodes up."""
+    def _build_levels(self, nodes: List[MerkleNode]) -> Optional[MerkleNode]:
+        """Build the Merkle tree from leaf nodes up, one level at a time."""
         if not nodes:
             return None
         
-        if len(nodes) == 1:
-            return nodes[0]
-        
-        # Create new level of nodes
-        new_level = []
-        
-        # Process pairs of nodes
-        for i in range(0, len(nodes), 2):
-            left = nodes[i]
+        while len(nodes) > 1:
             # If we have odd number, duplicate the last node
-            right = nodes[i+1] if i+1 < len(nodes) else left
+            if len(nodes) % 2 == 1:
+                nodes.append(nodes[-1])
             
-            # Create parent node with combined hash
-            parent_hash = self.hash_pair(left.hash_value, right.hash_value)
-            parent = MerkleNode(parent_hash, left=left, right=right)
-            new_level.append(parent)
+            # Hash the whole level at once, then link parents to their children
+            parent_hashes = _hash_level([node.hash_value for node in nodes], self._hash)
+            nodes = [
+                MerkleNode(parent_hash, left=nodes[2 * i], right=nodes[2 * i + 1])
+                for i, parent_hash in enumerate(parent_hashes)
+            ]
+        
+        return nodes[0]
+    
+    @staticmethod
+    def root_of(transactions: List[Dict[str, Any]], hash_algo: str = 'sha256') -> str:
+        """
+        Compute the Merkle root of a transaction list without building the tree.
         
-        # Recursively build the next level
-        return self._build_tree_recursive(new_level)
+        Produces the same hash as MerkleTree(transactions, hash_algo).get_root_hash()
+        but only keeps one level of hex digests in memory at a time.
+        """
+        hash_fn = _hasher(hash_algo)
+        if not transactions:
+            return hash_fn(b"").hexdigest()
+        
+        level = [
+            hash_fn(canonical_bytes(tx)).hexdigest()
+            for tx in transactions
+        ]
+        if len(level) % 2 == 1:
+            level.append(level[-1])
+        
+        while len(level) > 1:
+            level = _hash_level(level, hash_fn)
+        return level[0]
     
     def get_root_hash(self) -> str:
         """Get the Merkle root hash."""
         if self.root:
             return self.root.hash_value
-        return hashlib.sha256(b"").hexdigest()
+        return self._hash(b"").hexdigest()
     
     def get_proof(self, transaction: Dict[str, Any]) -> List[Dict[str, str]]:
         """
@@ -32,7 +32,8 @@ def test_key_generation(bit_length):
         
         m = 42  # Test message
         r = random.randint(1, n - 1)
-        c = (pow(g, m, n * n) * pow(r, n, n * n)) % (n * n)
+        # g = n + 1, so g^m mod n^2 is just 1 + m*n
+        c = ((1 + m * n) * pow(r, n, n * n)) % (n * n)
         decrypted = (L(pow(c, lambda_, n * n), n) * mu) % n
         
         if decrypted == m:
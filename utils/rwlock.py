@@ -0,0 +1,90 @@
+import threading
+from contextlib import contextmanager
+
+
+class RWLock:
+    """
+    Readers-preferred reader/writer lock.
+
+    Any number of threads may hold the read side at once; the write side is
+    exclusive. The writer is reentrant and may also take the read side, so
+    callbacks fired while writing can call read methods. Upgrading from read to
+    write would deadlock and raises RuntimeError instead.
+
+    Using the lock directly (`with lock:`) takes the write side, which keeps it
+    a drop-in replacement for an RLock.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None       # Thread ident of the current writer
+        self._write_depth = 0
+        self._local = threading.local()
+
+    def _read_depth(self) -> int:
+        return getattr(self._local, 'depth', 0)
+
+    def acquire_read(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me:
+                while self._writer is not None:
+                    self._cond.wait()
+                self._readers += 1
+        self._local.depth = self._read_depth() + 1
+
+    def release_read(self) -> None:
+        me = threading.get_ident()
+        self._local.depth = self._read_depth() - 1
+        with self._cond:
+            if self._writer != me:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if self._read_depth():
+                raise RuntimeError("cannot upgrade a read lock to a write lock")
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("cannot release a write lock that is not held")
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read_lock(self):
+        """Hold the shared (read) side for the duration of the block."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_lock(self):
+        """Hold the exclusive (write) side for the duration of the block."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def __enter__(self):
+        self.acquire_write()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release_write()
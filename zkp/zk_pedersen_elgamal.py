@@ -4,14 +4,39 @@ import time
 import threading
 import multiprocessing
 import json
+import os
+import pickle
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from tqdm import tqdm
 from .base import TransactionProof, RangeProof
 from tinyec import registry
-from tinyec.ec import Point
+from tinyec.ec import Point, Inf
+from utils.math_helpers import get_curve, fixed_base_table, fixed_base_mul, ladder_mul, multi_scalar_mul
+
+try:
+    from cryptography.hazmat.primitives.asymmetric import ec
+except ImportError:
+    ec = None
+
+# OpenSSL curve classes for the tinyec curves this module is used with
+_OPENSSL_CURVES = {
+    'secp192r1': 'SECP192R1',
+    'secp224r1': 'SECP224R1',
+    'secp256r1': 'SECP256R1',
+    'secp384r1': 'SECP384R1',
+    'secp521r1': 'SECP521R1',
+    'secp256k1': 'SECP256K1',
+}
 
 from constants import (
     SMALL_CURVE,
     MAX_VALUE_RANGE,
+    VALUE_TABLE_CACHE_DIR,
+    VALUE_TABLE_CACHE_VERSION,
+    VALUE_TABLE_PARALLEL_MIN,
+    FIXED_BASE_WINDOW,
     TX_MIN_AMOUNT,
     TX_MAX_AMOUNT,
     PEDERSEN_H_GENERATOR_SEED,
@@ -56,56 +81,251 @@ class ZKPoint(Point, JsonSerializable):
 
     @classmethod
     def from_dict(cls, data):
-        curve = registry.get_curve(data["curve"])
+        curve = get_curve(data["curve"])
         return cls(curve, data["x"], data["y"])
 
     @classmethod
     def from_json(cls, json_str):
         return cls.from_dict(json.loads(json_str))
 
+class _PointTerms:
+    """Scalar coefficients per point for a multi-scalar multiplication.
+    
+    tinyec points define __eq__ without __hash__, so coefficients are keyed by
+    coordinates; terms[P] += k works like a defaultdict(int).
+    """
+    __slots__ = ('_points', '_scalars')
+    
+    def __init__(self):
+        self._points = {}
+        self._scalars = {}
+    
+    def __getitem__(self, point):
+        return self._scalars.get((point.x, point.y), 0)
+    
+    def __setitem__(self, point, scalar):
+        key = (point.x, point.y)
+        self._points.setdefault(key, point)
+        self._scalars[key] = scalar
+    
+    def __len__(self):
+        return len(self._scalars)
+    
+    def pairs(self):
+        """(scalar, point) for every point with a coefficient."""
+        return [(scalar, self._points[key]) for key, scalar in self._scalars.items()]
+
+def _value_table_chunk(curve_name, lo, hi):
+    """x coordinates of i*G for i in [lo, hi), walked by repeated addition of G."""
+    G = get_curve(curve_name).g
+    point = lo * G
+    xs = []
+    for _ in range(lo, hi):
+        xs.append(point.x)
+        point = point + G
+    return xs
+
 class ZKPedersenElGamal:
-    def __init__(self, curve_name=SMALL_CURVE):
+    def __init__(self, curve_name=SMALL_CURVE, verbose=True):
+        # verbose=False silences progress messages and bars; failures still print
+        self.verbose = verbose
         # Cryptographic Primitives - same as before
         self.curve = registry.get_curve(curve_name)
         self.G = self.curve.g
         self.q = self.curve.field.n
+        self._identity = 0 * self.G
+        self._openssl_curve = self._load_openssl_curve(curve_name)
+        self._G_table = fixed_base_table(self.G, self.q.bit_length(), FIXED_BASE_WINDOW)
         
         # Create second generator for Pedersen commitments
         h_seed = hashlib.sha256(PEDERSEN_H_GENERATOR_SEED).digest()
         h_value = int.from_bytes(h_seed, byteorder="big") % self.q
-        self.H = h_value * self.G
+        self.H = self._ecmul(h_value, self.G)
+        self._H_table = fixed_base_table(self.H, self.q.bit_length(), FIXED_BASE_WINDOW)
         
         self.MAX_VALUE_RANGE = MAX_VALUE_RANGE
         self.VALUE_POINTS = {}
     
+    def _load_openssl_curve(self, curve_name):
+        """The OpenSSL curve matching curve_name, if cryptography is installed and supports it."""
+        if ec is None or curve_name not in _OPENSSL_CURVES:
+            return None
+        try:
+            curve = getattr(ec, _OPENSSL_CURVES[curve_name])()
+            public = ec.derive_private_key(2, curve).public_key().public_numbers()
+        except Exception:
+            return None
+        # Only trust the backend if it agrees with tinyec
+        expected = 2 * self.G
+        return curve if (public.x, public.y) == (expected.x, expected.y) else None
+    
+    def _ecmul(self, k, P):
+        """Scalar multiplication k*P.
+        
+        Multiples of the generator G go through OpenSSL when cryptography is
+        installed and knows the curve, and otherwise through a precomputed
+        window table, as do multiples of H. Other points use tinyec directly.
+        """
+        if P is self.G:
+            k %= self.q
+            if self._openssl_curve is not None and k:
+                public = ec.derive_private_key(k, self._openssl_curve).public_key().public_numbers()
+                return Point(self.curve, public.x, public.y)
+            return fixed_base_mul(k, self._G_table, FIXED_BASE_WINDOW)
+        if P is self.H:
+            return fixed_base_mul(k % self.q, self._H_table, FIXED_BASE_WINDOW)
+        return k * P
+    
     # Keep the original methods for compatibility
-    def generate_value_table(self, max_range=None):
-        """Generate precomputed table of values with progress reporting"""
+    def generate_value_table(self, max_range=None, cache_dir=VALUE_TABLE_CACHE_DIR):
+        """Generate precomputed table of values with progress reporting
+        
+        The table only depends on the curve and range, so it is written to
+        cache_dir/{curve}_{max_range}_v{VALUE_TABLE_CACHE_VERSION}.bin and loaded
+        from there on later runs. Pass cache_dir=None to always rebuild.
+        """
         if max_range is None:
             max_range = self.MAX_VALUE_RANGE
-            
-        print(f"Generating precomputed value table (0-{max_range})...")
         
-        for i in tqdm(range(max_range), desc="Building value table"):
-            point = i * self.G
-            self.VALUE_POINTS[point.x] = i
+        cache_path = None
+        if cache_dir is not None:
+            cache_name = f"{self.curve.name}_{max_range}_v{VALUE_TABLE_CACHE_VERSION}.bin"
+            cache_path = os.path.join(os.path.expanduser(cache_dir), cache_name)
+            table = self._load_value_table(cache_path, max_range)
+            if table is not None and self._value_table_valid(table, max_range):
+                self.VALUE_POINTS.update(table)
+                if self.verbose:
+                    print(f"✓ Loaded {max_range} precomputed values from {cache_path}")
+                return self.VALUE_POINTS
+        
+        if self.verbose:
+            print(f"Generating precomputed value table (0-{max_range})...")
+        
+        table = self._build_value_table(max_range)
+        self.VALUE_POINTS.update(table)
+        
+        if cache_path is not None:
+            self._save_value_table(cache_path, table)
         
-        print(f"✓ Precomputed {max_range} values for constant-time lookup")
+        if self.verbose:
+            print(f"✓ Precomputed {max_range} values for constant-time lookup")
         return self.VALUE_POINTS
     
+    def _build_value_table(self, max_range):
+        """Map the x coordinate of i*G to i for i in [0, max_range).
+        
+        Each point is the previous one plus G, which is far cheaper than a
+        scalar multiplication per entry. Large tables are split into one
+        contiguous run per CPU and walked in worker processes, which are
+        spawned so live threads (such as the state manager's key pools) are
+        never forked mid-lock.
+        """
+        workers = os.cpu_count() or 1
+        if max_range >= VALUE_TABLE_PARALLEL_MIN and workers > 1:
+            step = -(-max_range // workers)
+            bounds = [(lo, min(lo + step, max_range)) for lo in range(0, max_range, step)]
+            try:
+                table = {}
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                    futures = [executor.submit(_value_table_chunk, self.curve.name, lo, hi) for lo, hi in bounds]
+                    with tqdm(total=max_range, desc="Building value table", disable=not self.verbose) as progress:
+                        for (lo, _), future in zip(bounds, futures):
+                            xs = future.result()
+                            table.update(zip(xs, range(lo, lo + len(xs))))
+                            progress.update(len(xs))
+                return table
+            except (OSError, BrokenProcessPool, pickle.PicklingError):
+                pass
+        
+        table = {}
+        point = self._identity
+        for i in tqdm(range(max_range), desc="Building value table", disable=not self.verbose):
+            table[point.x] = i
+            point = point + self.G
+        return table
+    
+    def _load_value_table(self, cache_path, max_range):
+        """Read a cached value table, or return None if it is missing or the wrong size.
+        
+        The file is plain data: the x coordinates of i*G for i in [1, max_range)
+        as fixed-width big-endian integers (0*G is the point at infinity).
+        """
+        width = (self.curve.field.p.bit_length() + 7) // 8
+        try:
+            with open(cache_path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+        if not max_range or len(data) != (max_range - 1) * width:
+            return None
+        
+        view = memoryview(data)
+        table = {None: 0}
+        for i, offset in enumerate(range(0, len(data), width), 1):
+            table[int.from_bytes(view[offset:offset + width], 'big')] = i
+        return table
+    
+    def _value_table_valid(self, table, max_range):
+        """Spot-check a loaded table: the right size, and one random entry maps back to its point."""
+        if len(table) != max_range or not max_range:
+            return False
+        # Entry 0 (the point at infinity) is the same in every table, so skip it
+        i = random.randrange(1, max_range) if max_range > 1 else 0
+        return table.get(self._ecmul(i, self.G).x) == i
+    
+    def _save_value_table(self, cache_path, table):
+        """Write a value table to the cache; failures only cost a rebuild next time."""
+        width = (self.curve.field.p.bit_length() + 7) // 8
+        xs = [None] * len(table)
+        for x, i in table.items():
+            xs[i] = x
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                file.write(b''.join(x.to_bytes(width, 'big') for x in xs[1:]))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
     def constant_time_decrypt(self, ciphertext, sk, max_range=None):
         """Decrypt ElGamal ciphertext in constant time"""
         if max_range is None:
             max_range = self.MAX_VALUE_RANGE
             
         c1, c2 = ciphertext
-        decrypted_point = c2 - sk * c1
+        decrypted_point = c2 - ladder_mul(sk, c1)
         
         return self.VALUE_POINTS.get(decrypted_point.x)
     
+    def constant_time_decrypt_from_ints(self, c1_x, c1_y, c2_x, c2_y, sk):
+        """Decrypt a ciphertext given as raw coordinates.
+        
+        Only c1 is built as a Point (one curve check). c2 - sk*c1 is computed
+        with affine arithmetic on the coordinates since just its x is needed.
+        """
+        p = self.curve.field.p
+        shared = ladder_mul(sk, Point(self.curve, c1_x, c1_y))
+        if shared.x is None:
+            return self.VALUE_POINTS.get(c2_x)
+        
+        # Add c2 and -shared
+        x, y = shared.x, -shared.y % p
+        if c2_x == x:
+            if c2_y != y:
+                # c2 == shared, so the difference is the point at infinity
+                return self.VALUE_POINTS.get(None)
+            m = (3 * x * x + self.curve.a) * pow(2 * y, -1, p)
+        else:
+            m = (c2_y - y) * pow(c2_x - x, -1, p)
+        return self.VALUE_POINTS.get((m * m - c2_x - x) % p)
+    
     def pedersen_commit(self, value, blinding_factor):
         """Create a Pedersen commitment to a value"""
-        result = value * self.G + blinding_factor * self.H
+        result = self._ecmul(value, self.G) + self._ecmul(blinding_factor, self.H)
         # Return as ZKPoint if needed for serialization
         return ZKPoint(result.curve, result.x, result.y)
     
@@ -126,12 +346,12 @@ class ZKPedersenElGamal:
             
             # Real branch (proving commitment = 0)
             w0 = random.randint(1, self.q-1)
-            t0 = w0 * self.H  # t0 is commitment for the real proof
+            t0 = self._ecmul(w0, self.H)  # t0 is commitment for the real proof
             
             # Simulated branch (proving commitment = 1)
             c1 = random.randint(1, self.q-1)  
             s1 = random.randint(1, self.q-1)
-            t1 = s1 * self.H - c1 * (bit_comm - self.G)  # Simulated proof for bit = 1
+            t1 = self._ecmul(s1, self.H) - ladder_mul(c1, bit_comm - self.G)  # Simulated proof for bit = 1
             
             # Compute challenge
             c = self.hash_to_scalar(f"{bit_comm.x}:{bit_comm.y}:{t0.x}:{t0.y}:{t1.x}:{t1.y}")
@@ -146,12 +366,12 @@ class ZKPedersenElGamal:
             
             # Real branch (proving commitment = 1)
             w1 = random.randint(1, self.q-1)
-            t1 = w1 * self.H  # t1 is commitment for the real proof
+            t1 = self._ecmul(w1, self.H)  # t1 is commitment for the real proof
             
             # Simulated branch (proving commitment = 0)
             c0 = random.randint(1, self.q-1)
             s0 = random.randint(1, self.q-1)
-            t0 = s0 * self.H - c0 * bit_comm  # Simulated proof for bit = 0
+            t0 = self._ecmul(s0, self.H) - ladder_mul(c0, bit_comm)  # Simulated proof for bit = 0
             
             # Compute challenge
             c = self.hash_to_scalar(f"{bit_comm.x}:{bit_comm.y}:{t0.x}:{t0.y}:{t1.x}:{t1.y}")
@@ -193,10 +413,10 @@ class ZKPedersenElGamal:
         
         # Verify both branches
         # For case 0 (commitment = 0): verify t0 = s0*H - c0*bit_comm
-        t0_check = s0 * self.H - c0 * bit_comm
+        t0_check = self._ecmul(s0, self.H) - ladder_mul(c0, bit_comm)
         
         # For case 1 (commitment = 1): verify t1 = s1*H - c1*(bit_comm - G)
-        t1_check = s1 * self.H - c1 * (bit_comm - self.G)
+        t1_check = self._ecmul(s1, self.H) - ladder_mul(c1, bit_comm - self.G)
         
         if t0_check != t0:
             print(f"t0 verification failed")
@@ -267,7 +487,7 @@ class ZKPedersenElGamal:
         blinding_diff = (blinding - weighted_blinding) % self.q
         
         w_sum = random.randint(1, self.q-1)
-        t_sum = w_sum * self.H
+        t_sum = self._ecmul(w_sum, self.H)
         c_sum = self.hash_to_scalar(f"{commitment.x}:{commitment.y}:{t_sum.x}:{t_sum.y}")
         s_sum = (w_sum + c_sum * blinding_diff) % self.q
         
@@ -283,8 +503,15 @@ class ZKPedersenElGamal:
             }
         }
 
-    def verify_range_proof(self, proof):
-        """Verify a zero-knowledge range proof."""
+    def _range_proof_terms(self, proof, terms):
+        """Check a range proof's structure and challenges, then add its curve equations to `terms`.
+        
+        Every equation t == s*H - c*X is rewritten as s*H - c*X - t == 0 and
+        scaled by a fresh random weight, so the sum of all of them is the
+        point at infinity exactly when (with overwhelming probability) each
+        one holds. Returns False as soon as a non-curve check fails.
+        """
+        q = self.q
         commitment = proof['commitment']
         min_val, max_val = proof['range']
         bit_commitments = proof['bit_commitments']
@@ -296,8 +523,8 @@ class ZKPedersenElGamal:
         if len(bit_commitments) != n_bits or len(bit_proofs) != n_bits:
             return False
         
-        # Verify each bit proof (that each commitment is to either 0 or 1)
-        for i, (bit_comm, proof_data) in enumerate(zip(bit_commitments, bit_proofs)):
+        # Each bit commitment is an OR proof that it commits to either 0 or 1
+        for bit_comm, proof_data in zip(bit_commitments, bit_proofs):
             t0 = proof_data['t0']
             t1 = proof_data['t1']
             c = proof_data['c']
@@ -307,7 +534,7 @@ class ZKPedersenElGamal:
             s1 = proof_data['s1']
             
             # Check that the sub-challenges sum to the overall challenge
-            if (c0 + c1) % self.q != c:
+            if (c0 + c1) % q != c:
                 return False
             
             # Recompute the challenge using the same hash as in creation
@@ -315,27 +542,14 @@ class ZKPedersenElGamal:
             if c_computed != c:
                 return False
             
-            # Verify both branches of the OR proof
-            # For case 0 (proving commitment is to 0):
-            # t0 = s0 * H - c0 * bit_comm
-            t0_check = s0 * self.H - c0 * bit_comm
-            
-            # For case 1 (proving commitment is to 1):
-            # t1 = s1 * H - c1 * (bit_comm - G)
-            t1_check = s1 * self.H + c1 * self.G - c1 * bit_comm
-            
-            if t0_check != t0 or t1_check != t1:
-                return False
-        
-        # Verify the weighted sum proof
-        weighted_commitment = 0 * self.G
-        
-        for i, bit_comm in enumerate(bit_commitments):
-            weight = 2**i
-            weighted_commitment += weight * bit_comm
-        
-        expected_commitment = weighted_commitment + (min_val * self.G)
-        diff_commitment = commitment - expected_commitment
+            # Case 0: t0 = s0*H - c0*bit_comm
+            # Case 1: t1 = s1*H - c1*(bit_comm - G)
+            w0, w1 = secrets.randbits(128), secrets.randbits(128)
+            terms[self.H] += w0 * s0 + w1 * s1
+            terms[self.G] += w1 * c1
+            terms[bit_comm] -= w0 * c0 + w1 * c1
+            terms[t0] -= w0
+            terms[t1] -= w1
         
         t_sum = sum_proof['t']
         c_sum = sum_proof['c']
@@ -345,21 +559,44 @@ class ZKPedersenElGamal:
         if c_sum_computed != c_sum:
             return False
         
-        # Verify the Schnorr-style proof for the blinding factor difference
-        t_sum_check = s_sum * self.H - c_sum * diff_commitment
-        if t_sum_check != t_sum:
-            return False
-        
+        # Schnorr-style proof for the blinding factor difference:
+        # t_sum = s_sum*H - c_sum*(commitment - sum(2^i * bit_comm_i) - min_val*G)
+        w = secrets.randbits(128)
+        terms[self.H] += w * s_sum
+        terms[commitment] -= w * c_sum
+        terms[self.G] += w * c_sum * min_val
+        for i, bit_comm in enumerate(bit_commitments):
+            terms[bit_comm] += w * c_sum << i
+        terms[t_sum] -= w
         return True
+    
+    def batch_verify_range_proofs(self, proofs):
+        """Verify several range proofs with a single multi-scalar multiplication.
+        
+        Returns True only if every proof is valid; callers that need to know
+        which one failed can fall back to verify_range_proof on each.
+        """
+        terms = _PointTerms()
+        for proof in proofs:
+            if not self._range_proof_terms(proof, terms):
+                return False
+        if not terms:
+            return True
+        scalars, points = zip(*terms.pairs())
+        return isinstance(multi_scalar_mul(scalars, points), Inf)
+    
+    def verify_range_proof(self, proof):
+        """Verify a zero-knowledge range proof."""
+        return self.batch_verify_range_proofs([proof])
 
     def schnorr_sign(self, sk, message):
         """Create a Schnorr signature for a message using private key sk."""
         # Generate random nonce
         k = random.randint(1, self.q-1)
-        R = k * self.G
+        R = self._ecmul(k, self.G)
         
         # Generate public key from private key
-        pk = sk * self.G
+        pk = self._ecmul(sk, self.G)
         
         # Hash the message together with public key and R
         # This binds the signature to the message
@@ -383,18 +620,18 @@ class ZKPedersenElGamal:
             return False
         
         # Verify the signature equation: R = s*G + e*pk
-        R_check = s * self.G + e * pk
+        R_check = self._ecmul(s, self.G) + e * pk
         
         return R_check == R
 
     def schnorr_prove(self, x, P=None):
         """Generate a Schnorr proof of knowledge of discrete logarithm."""
         if P is None:
-            P = x * self.G
+            P = self._ecmul(x, self.G)
             
         # Random nonce
         k = random.randint(1, self.q-1)
-        R = k * self.G
+        R = self._ecmul(k, self.G)
         
         # Challenge
         c = self.hash_to_scalar(f"{P.x}:{P.y}:{R.x}:{R.y}")
@@ -409,7 +646,7 @@ class ZKPedersenElGamal:
         c, s = proof
         
         # Reconstruct R = s*G + c*P
-        R = s * self.G + c * P
+        R = self._ecmul(s, self.G) + c * P
         
         # Check if challenge matches
         expected_c = self.hash_to_scalar(f"{P.x}:{P.y}:{R.x}:{R.y}")
@@ -500,11 +737,11 @@ class ZKPedersenElGamal:
         
         # Compute commitments for the proof
         # For the ElGamal part
-        R1 = re * self.G
-        R2 = rv * self.G + re * recipient_pk
+        R1 = self._ecmul(re, self.G)
+        R2 = self._ecmul(rv, self.G) + re * recipient_pk
         
         # For the Pedersen part
-        R3 = rv * self.G + rp * self.H
+        R3 = self._ecmul(rv, self.G) + self._ecmul(rp, self.H)
         
         # Create challenge
         c = self.hash_to_scalar(f"{ciphertext[0].x}:{ciphertext[0].y}:{ciphertext[1].x}:{ciphertext[1].y}:"
@@ -544,14 +781,14 @@ class ZKPedersenElGamal:
         
         # Verify the proof equations
         # Check ElGamal part
-        R1_check = se * self.G - c * ciphertext[0]
-        R2_check = sv * self.G + se * recipient_pk - c * ciphertext[1]
+        R1_check = self._ecmul(se, self.G) - c * ciphertext[0]
+        R2_check = self._ecmul(sv, self.G) + se * recipient_pk - c * ciphertext[1]
         
         if R1_check != R1 or R2_check != R2:
             return False
         
         # Check Pedersen part
-        R3_check = sv * self.G + sp * self.H - c * commitment
+        R3_check = self._ecmul(sv, self.G) + self._ecmul(sp, self.H) - c * commitment
         
         if R3_check != R3:
             return False
@@ -593,8 +830,8 @@ class ZKPedersenElGamal:
         
         # Encrypt the amount for recipient using standard ElGamal
         recipient_ciphertext = (
-            amount_elgamal_randomness * self.G, 
-            amount * self.G + amount_elgamal_randomness * recipient_pk
+            self._ecmul(amount_elgamal_randomness, self.G), 
+            self._ecmul(amount, self.G) + amount_elgamal_randomness * recipient_pk
         )
         
         # Generate a Pedersen commitment to the amount
@@ -633,8 +870,8 @@ class ZKPedersenElGamal:
             # Create new ciphertext for remaining balance
             balance_elgamal_randomness = random.randint(1, self.q-1)
             remaining_balance_ciphertext = (
-                balance_elgamal_randomness * self.G,
-                remaining_balance * self.G + balance_elgamal_randomness * sender_pk
+                self._ecmul(balance_elgamal_randomness, self.G),
+                self._ecmul(remaining_balance, self.G) + balance_elgamal_randomness * sender_pk
             )
             
             # Generate a Pedersen commitment to the remaining balance
@@ -739,7 +976,7 @@ class ZKPedersenElGamal:
                 return False
             
             # Verify ciphertext doesn't represent the identity element (which could be problematic)
-            if ciphertext_c1 == 0 * self.G or ciphertext_c2 == 0 * self.G:
+            if ciphertext_c1 == self._identity or ciphertext_c2 == self._identity:
                 print("❌ Invalid ciphertext (contains identity element)")
                 return False
                 
@@ -798,12 +1035,8 @@ class ZKPedersenElGamal:
             print("❌ Invalid amount equality proof")
             return False
         
-        # Then verify the range proof
-        if not self.verify_range_proof(amount_proof['range_proof']):
-            print("❌ Invalid amount range proof")
-            return False
-        
         # Step 3: If balance proof provided, verify it
+        range_proofs = [amount_proof['range_proof']]
         if transaction['balance_proof']:
             balance_proof = transaction['balance_proof']
             
@@ -817,17 +1050,24 @@ class ZKPedersenElGamal:
                 print("❌ Invalid balance equality proof")
                 return False
             
-            # Verify the range proof for remaining balance
-            if not self.verify_range_proof(balance_proof['range_proof']):
-                print("❌ Invalid balance range proof")
-                return False
-            
             # Verify the subtraction relationship
             if not self.verify_subtraction_proof(balance_proof['subtraction_proof']):
                 print("❌ Invalid balance subtraction proof")
                 return False
+            
+            range_proofs.append(balance_proof['range_proof'])
+        
+        # Then verify the amount and remaining-balance range proofs together,
+        # re-checking them one at a time only to report which one failed
+        if not self.batch_verify_range_proofs(range_proofs):
+            if not self.verify_range_proof(amount_proof['range_proof']):
+                print("❌ Invalid amount range proof")
+            else:
+                print("❌ Invalid balance range proof")
+            return False
 
-        print("✓ Transaction verified successfully!")
+        if self.verbose:
+            print("✓ Transaction verified successfully!")
         return True
 
 
@@ -842,7 +1082,7 @@ class ZKAccount:
     
     def _generate_keypair(self):
         sk = random.randint(1, self.zk_system.q-1)
-        pk = sk * self.zk_system.G
+        pk = self.zk_system._ecmul(sk, self.zk_system.G)
         return sk, pk
     
     def deposit(self, amount):
@@ -853,7 +1093,8 @@ class ZKAccount:
             'amount': amount,
             'timestamp': time.time()
         })
-        print(f"{self.name} deposited {amount}")
+        if self.zk_system.verbose:
+            print(f"{self.name} deposited {amount}")
     
     def send(self, recipient, amount):
         """Send funds to recipient with privacy."""